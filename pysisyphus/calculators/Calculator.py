@@ -1,5 +1,7 @@
+import atexit
 from dataclasses import dataclass
 from enum import Enum
+import fnmatch
 import logging
 import os
 from pathlib import Path
@@ -57,6 +59,7 @@ class Calculator:
         out_dir=OUT_DIR_DEFAULT,
         force_num_hess=False,
         num_hess_kwargs=None,
+        reuse_path=False,
     ):
         """Base-class of all calculators.
 
@@ -95,6 +98,10 @@ class Calculator:
             Force numerical Hessians.
         num_hess_kwargs : dict
             Keyword arguments for finite difference Hessian calculation.
+        reuse_path : bool, default False
+            Run all calculations in one temporary directory that is created
+            once and emptied between calculations, instead of creating and
+            deleting a new directory for every calculation.
         """
 
         self.logger = logging.getLogger("calculator")
@@ -132,6 +139,9 @@ class Calculator:
             self.reattach(int(last_calc_cycle))
             self.log(f"Set {self.calc_counter} for this calculation")
         self.clean_after = clean_after
+        self.reuse_path = reuse_path
+        # Persistent temporary directory, used when reuse_path is True.
+        self._scratch_path = None
 
         self.inp_fn = "calc.inp"
         self.out_fn = "calc.out"
@@ -284,12 +294,48 @@ class Calculator:
                 Prepared directory.
         """
 
-        prefix = f"{self.name}_{self.calc_counter:03d}_"
-        path = Path(tempfile.mkdtemp(prefix=prefix))
+        if self.reuse_path:
+            path = self.get_scratch_path()
+        else:
+            prefix = f"{self.name}_{self.calc_counter:03d}_"
+            path = Path(tempfile.mkdtemp(prefix=prefix))
         if use_in_run:
             self.path_already_prepared = path
         return path
 
+    def get_scratch_path(self):
+        """Get the persistent temporary directory used with reuse_path.
+
+        The directory is created on first use and removed at interpreter
+        exit. Leftovers from a previous calculation are deleted, so every
+        calculation starts in an empty directory.
+
+        Returns
+        -------
+            path: Path
+                Empty, persistent directory.
+        """
+        if self._scratch_path is None:
+            self._scratch_path = Path(tempfile.mkdtemp(prefix=f"{self.name}_"))
+            atexit.register(shutil.rmtree, self._scratch_path, ignore_errors=True)
+        path = self._scratch_path
+        if path.exists():
+            self.empty_path(path)
+        # The directory may have been deleted by a derived class.
+        else:
+            path.mkdir(parents=True)
+        return path
+
+    @staticmethod
+    def empty_path(path):
+        """Delete all contents of a directory, but keep the directory itself."""
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+
     def prepare(self, inp):
         """Prepare a temporary directory and write input.
 
@@ -380,12 +426,8 @@ class Calculator:
             3D-array holding coordinates in Angstrom.
         """
         coords = coords.reshape(-1, 3) * BOHR2ANG
-        coords = "\n".join(
-            [
-                "{} {:10.08f} {:10.08f} {:10.08f}".format(a, *c)
-                for a, c in zip(atoms, coords)
-            ]
-        )
+        fmt = "{} {:10.08f} {:10.08f} {:10.08f}".format
+        coords = "\n".join(map(fmt, atoms, *coords.T.tolist()))
         return coords
 
     def prepare_xyz_string(self, atoms, coords):
@@ -557,7 +599,8 @@ class Calculator:
             parser_kwargs = {} if parser_kwargs is None else parser_kwargs
             results = self.parser_funcs[calc](path, **parser_kwargs)
             if keep:
-                self.keep(path)
+                # Files can be moved instead of copied, when path is deleted afterwards.
+                self.keep(path, move=(not hold) and self.clean_after)
 
         except Exception as err:
             print("Crashed input:")
@@ -685,13 +728,17 @@ class Calculator:
                     os.remove(f)
             del self.kept_history[cycle]
 
-    def keep(self, path):
+    def keep(self, path, move=False):
         """Backup calculation results.
 
         Parameters
         ----------
         path : Path
             Temporary directory of the calculation.
+        move : bool, optional
+            Move files instead of copying them. Only useful when path is
+            deleted afterwards. Falls back to copying when moving fails,
+            e.g., across filesystems.
 
         Returns
         -------
@@ -701,9 +748,13 @@ class Calculator:
         """
 
         kept_fns = dict()
+        # Only scan the directory once; the patterns are matched against its entries.
+        with os.scandir(path) as it:
+            fns = [entry.name for entry in it]
         for raw_pattern in self.to_keep:
             pattern, multi, key = self.prepare_pattern(raw_pattern)
-            globbed = natsorted(path.glob(pattern))
+            # Only the matched filenames have to be sorted.
+            globbed = [path / fn for fn in natsorted(fnmatch.filter(fns, pattern))]
             if not multi:
                 assert len(globbed) <= 1, (
                     f"Expected at most one file "
@@ -717,7 +768,16 @@ class Calculator:
             for tmp_fn in globbed:
                 base = tmp_fn.name
                 new_fn = self.make_fn(base)
-                shutil.copy(tmp_fn, new_fn)
+                moved = False
+                if move:
+                    try:
+                        os.replace(tmp_fn, new_fn)
+                        moved = True
+                    # E.g., when path and self.out_dir are on different filesystems
+                    except OSError:
+                        pass
+                if not moved:
+                    shutil.copy(tmp_fn, new_fn)
                 if multi:
                     kept_fns[key].append(new_fn)
                 else:
@@ -747,12 +807,17 @@ class Calculator:
     def clean(self, path):
         """Delete the temporary directory.
 
+        When reuse_path is set, only the contents of the directory are deleted.
+
         Parameters
         ----------
         path : Path
             Directory to delete.
         """
-        shutil.rmtree(path)
+        if self.reuse_path and path == self._scratch_path:
+            self.empty_path(path)
+        else:
+            shutil.rmtree(path)
         self.log(f"Cleaned {path}")
 
     def get_restart_info(self):
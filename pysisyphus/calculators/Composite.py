@@ -1,5 +1,4 @@
 import numpy as np
-import sympy as sym
 
 # from sympy import sympify, lambdify,
 
@@ -55,6 +54,8 @@ class Composite(Calculator):
         self.final = final
         self.remove_translation = remove_translation
 
+        import sympy as sym
+
         # The energies are just numbers that we can easily substitute in
         self.energy_expr = sym.sympify(self.final)
         # The forces/Hessians are matrices that we can't just easily substitute in.
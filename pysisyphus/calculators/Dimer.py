@@ -157,7 +157,8 @@ class Dimer(Calculator):
             msg = "Setting initial orientation from given 'N_raw'"
             if isinstance(self.N_raw, str) and Path(self.N_raw).exists():
                 fn = self.N_raw
-                self.N_raw = np.loadtxt(fn)
+                load_func = np.load if fn.endswith(".npy") else np.loadtxt
+                self.N_raw = load_func(fn)
                 msg = f"Read initial orientation from file '{fn}'"
                 N_raw = self.N_raw.copy()
             self.N = N_raw
@@ -620,8 +621,8 @@ class Dimer(Calculator):
                 handle.write(trj_str)
             self.log(f"Wrote current orientation animation to '{trj_fn}'")
         # Always save orientation in Bohr
-        N_fn = self.make_fn("N")
-        np.savetxt(N_fn, N)
+        N_fn = self.make_fn("N.npy")
+        np.save(N_fn, N)
 
         energy = self.energy0
         self.log(f"\tenergy={self.energy0:.8f} au")
@@ -1,17 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 import logging
 import sys
 
-from distributed import Client
 import numpy as np
 from scipy.interpolate import interp1d, splprep, splev
 
+from pysisyphus.Geometry import Geometry
 from pysisyphus.helpers import align_coords, get_coords_diffs
 from pysisyphus.helpers_pure import hash_arr
 from pysisyphus.modefollow import geom_lanczos
 
 
 # [1] http://dx.doi.org/10.1063/1.1323224
+# [2] Scaled and Dynamic Optimizations of Nudged Elastic Bands
+#     Lindgren, Kastlunger, Peterson, 2019
+
+
+def upwinding_tangent(
+    tangent_plus, tangent_minus, prev_energy, ith_energy, next_energy
+):
+    """Unnormalized upwinding tangent. [1] Equations (8) - (11)"""
+    next_energy_diff = abs(next_energy - ith_energy)
+    prev_energy_diff = abs(prev_energy - ith_energy)
+    delta_energy_max = max(next_energy_diff, prev_energy_diff)
+    delta_energy_min = min(next_energy_diff, prev_energy_diff)
+
+    # Uphill
+    if next_energy > ith_energy > prev_energy:
+        tangent = tangent_plus
+    # Downhill
+    elif next_energy < ith_energy < prev_energy:
+        tangent = tangent_minus
+    # Minimum or Maximum
+    else:
+        if next_energy >= prev_energy:
+            tangent = tangent_plus * delta_energy_max + tangent_minus * delta_energy_min
+        # next_energy < prev_energy
+        else:
+            tangent = tangent_plus * delta_energy_min + tangent_minus * delta_energy_max
+    return tangent
+
+
+def get_cart_tangent(cart_coords, energies, i):
+    """Normalized upwinding tangent at image i from plain arrays.
+
+    Yields the same tangent as ChainOfStates.get_tangent() for Cartesian
+    images, without the need to create Geometry and ChainOfStates objects.
+
+    Parameters
+    ----------
+    cart_coords
+        2d array of shape (nimages, 3*natoms) holding Cartesian coordinates.
+    energies
+        1d array of shape (nimages, ) holding the image energies.
+    i
+        Index of the image.
+    """
+    last_index = len(cart_coords) - 1
+    prev_index = max(i - 1, 0)
+    next_index = min(i + 1, last_index)
+
+    tangent_plus = cart_coords[next_index] - cart_coords[i]
+    tangent_minus = cart_coords[i] - cart_coords[prev_index]
+
+    # Handle first and last image
+    if i == 0:
+        tangent = tangent_plus
+    elif i == last_index:
+        tangent = tangent_minus
+    else:
+        tangent = upwinding_tangent(
+            tangent_plus,
+            tangent_minus,
+            energies[prev_index],
+            energies[i],
+            energies[next_index],
+        )
+    return tangent / np.linalg.norm(tangent)
 
 
 class ChainOfStates:
@@ -28,8 +94,16 @@ class ChainOfStates:
         climb_lanczos=False,
         climb_lanczos_rms=5e-3,
         climb_fixed=True,
+        ci_mmf=False,
+        ci_mmf_after=0.5,
+        ci_mmf_nsteps=10,
+        ci_mmf_dimer_kwargs=None,
+        ci_mmf_opt_kwargs=None,
         energy_min_mix=False,
         scheduler=None,
+        max_workers=1,
+        dyn_conv_alpha=None,
+        dyn_conv_thresh=None,
         progress=False,
     ):
         assert len(images) >= 2, "Need at least 2 images!"
@@ -40,10 +114,28 @@ class ChainOfStates:
         self.climb_rms = climb_rms
         self.climb_lanczos = climb_lanczos
         self.climb_fixed = climb_fixed
+        # Refine the climbing image with the dimer method, see ci_mmf_refine()
+        self.ci_mmf = ci_mmf
+        self.ci_mmf_after = float(ci_mmf_after)
+        self.ci_mmf_nsteps = int(ci_mmf_nsteps)
+        if ci_mmf_dimer_kwargs is None:
+            ci_mmf_dimer_kwargs = dict()
+        self.ci_mmf_dimer_kwargs = ci_mmf_dimer_kwargs
+        if ci_mmf_opt_kwargs is None:
+            ci_mmf_opt_kwargs = dict()
+        self.ci_mmf_opt_kwargs = ci_mmf_opt_kwargs
+        self.ci_mmf_done = False
         self.energy_min_mix = energy_min_mix
         # Must not be lower than climb_rms
         self.climb_lanczos_rms = min(self.climb_rms, climb_lanczos_rms)
         self.scheduler = scheduler
+        # Number of images that are calculated in parallel by threads. Only
+        # useful when every image has its own calculator.
+        self.max_workers = int(max_workers)
+        # Dynamic convergence of images, see freeze_converged_images(). When no
+        # threshold is given, it is derived from the optimizer's thresholds.
+        self.dyn_conv_alpha = dyn_conv_alpha
+        self.dyn_conv_thresh = dyn_conv_thresh
         self.progress = progress
 
         self._coords = None
@@ -69,6 +161,9 @@ class ChainOfStates:
         self.fixed_climb_indices = None
         # Use original forces for these images
         self.org_forces_indices = list()
+        # Images that are not recalculated in the current cycle
+        self.dyn_conv_frozen = list()
+        self.image_snapshots = None
 
         img0 = self.images[0]
         self.image_atoms = copy(img0.atoms)
@@ -79,6 +174,9 @@ class ChainOfStates:
         assert all(
             [img.coord_type == self.coord_type for img in self.images]
         ), "coord_type of images differ!"
+        assert (not self.ci_mmf) or (
+            self.coord_type in ("cart", "cartesian")
+        ), "'ci_mmf' is only supported for Cartesian coordinates!"
         try:
             self.typed_prims = img0.internal.typed_prims
         except AttributeError:
@@ -191,6 +289,12 @@ class ChainOfStates:
     def image_coords(self):
         return np.array([image.coords for image in self.images])
 
+    @property
+    def image_cart_coords(self):
+        """Return a 2d array of shape (nimages, 3*natoms), containing the
+        cartesian coordinates of all images."""
+        return np.array([image.cart_coords for image in self.images])
+
     def set_coords_at(self, i, coords):
         """Called from helpers.procrustes with cartesian coordinates.
         Then tries to set cartesian coordinate as self.images[i].coords
@@ -211,7 +315,15 @@ class ChainOfStates:
 
     @property
     def energy(self):
-        self._energy = np.array([image.energy for image in self.images])
+        """Energies of all images, gathered into a 1d array.
+
+        Every image caches its own energy, so only missing energies are
+        calculated."""
+        self._energy = np.fromiter(
+            (image.energy for image in self.images),
+            dtype=float,
+            count=len(self.images),
+        )
         return self._energy
 
     @energy.setter
@@ -235,8 +347,10 @@ class ChainOfStates:
         # Determine the number of images for which we have to do calculations.
         # There may also be calculations for fixed images, as they need an
         # energy value. But every fixed image only needs a calculation once.
-        images_to_calculate = self.moving_images
-        image_indices = self.moving_indices
+        image_indices = [
+            i for i in self.moving_indices if i not in self.dyn_conv_frozen
+        ]
+        images_to_calculate = [self.images[i] for i in image_indices]
         if self.fix_first and (self.images[0]._energy is None):
             images_to_calculate = [self.images[0]] + images_to_calculate
             image_indices = [0] + list(image_indices)
@@ -251,6 +365,12 @@ class ChainOfStates:
             self.log(client)
             image_futures = client.map(self.par_image_calc, images_to_calculate)
             self.set_images(image_indices, client.gather(image_futures))
+        # Parallel calculation with threads. Most calculators run external
+        # programs in subprocesses, so the GIL is released while waiting.
+        elif self.max_workers > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Consume the iterator, so exceptions are propagated
+                list(executor.map(self.par_image_calc, images_to_calculate))
         # Serial calculation
         else:
             for image in images_to_calculate:
@@ -294,6 +414,13 @@ class ChainOfStates:
         forces = np.array([image.forces for image in self.images])
         self.all_energies.append(energies)
         self.all_true_forces.append(forces)
+        # Keep Cartesian coordinates and results of all images, so converged
+        # images can be restored in the next cycle.
+        if self.dyn_conv_alpha is not None:
+            self.image_snapshots = [
+                (image.cart_coords, image.energy, image.cart_forces)
+                for image in self.images
+            ]
 
         return {
             "energies": energies,
@@ -413,34 +540,13 @@ class ChainOfStates:
             tangent = first_term + sec_term
         # Upwinding tangent from [1] Eq. (8) and so on
         elif kind == "upwinding":
-            prev_energy = prev_image.energy
-            ith_energy = ith_image.energy
-            next_energy = next_image.energy
-
-            next_energy_diff = abs(next_energy - ith_energy)
-            prev_energy_diff = abs(prev_energy - ith_energy)
-            delta_energy_max = max(next_energy_diff, prev_energy_diff)
-            delta_energy_min = min(next_energy_diff, prev_energy_diff)
-
-            # Uphill
-            if next_energy > ith_energy > prev_energy:
-                tangent = tangent_plus
-            # Downhill
-            elif next_energy < ith_energy < prev_energy:
-                tangent = tangent_minus
-            # Minimum or Maximum
-            else:
-                if next_energy >= prev_energy:
-                    tangent = (
-                        tangent_plus * delta_energy_max
-                        + tangent_minus * delta_energy_min
-                    )
-                # next_energy < prev_energy
-                else:
-                    tangent = (
-                        tangent_plus * delta_energy_min
-                        + tangent_minus * delta_energy_max
-                    )
+            tangent = upwinding_tangent(
+                tangent_plus,
+                tangent_minus,
+                prev_image.energy,
+                ith_image.energy,
+                next_image.energy,
+            )
         elif kind == "lanczos":
             # Calculating a lanczos tangent is costly, so we store the
             # tangent in a dictionary. The current coordinates are
@@ -479,13 +585,15 @@ class ChainOfStates:
         return "\n".join([image.as_xyz() for image in self.images])
 
     def get_dask_client(self):
+        from distributed import Client
+
         return Client(self.scheduler)
 
     def get_hei_index(self, energies=None):
         """Return index of highest energy image."""
         if energies is None:
-            energies = [image.energy for image in self.images]
-        return np.argmax(energies)
+            energies = self.energy
+        return int(np.argmax(energies))
 
     def prepare_opt_cycle(self, last_coords, last_energies, last_forces):
         """Implements additional logic in preparation of the next
@@ -498,6 +606,9 @@ class ChainOfStates:
         self.coords_list.append(last_coords)
         self.forces_list.append(last_forces)
 
+        if self.dyn_conv_alpha is not None:
+            self.restore_frozen_images()
+
         # Return False if we don't want to climb or are already
         # climbing.
         already_climbing = self.started_climbing
@@ -511,6 +622,10 @@ class ChainOfStates:
         if already_climbing and self.climb_fixed and (self.fixed_climb_indices is None):
             self.fixed_climb_indices = self.get_climbing_indices()
 
+        ci_refined = False
+        if self.ci_mmf and already_climbing and not self.ci_mmf_done:
+            ci_refined = self.ci_mmf_refine(last_energies, last_forces)
+
         already_climbing_lanczos = self.started_climbing_lanczos
         if (
             self.climb_lanczos
@@ -525,7 +640,139 @@ class ChainOfStates:
                 self.log(msg)
                 print(msg)
 
-        return not already_climbing and self.started_climbing
+        return (not already_climbing and self.started_climbing) or ci_refined
+
+    def ci_mmf_refine(self, last_energies, last_forces):
+        """Refine the climbing image (CI) with a few steps of the dimer method.
+
+        When the forces on the CI drop below 'ci_mmf_after' times the biggest
+        force on the remaining images, the CI is decoupled from the band and
+        optimized for 'ci_mmf_nsteps' cycles with the dimer method. The HEI
+        tangent serves as initial dimer orientation. Afterwards the optimization
+        of the band is resumed. The refinement is only done once.
+
+        Returns True, when the CI was refined.
+        """
+        # Local imports, as the optimizers import ChainOfStates
+        from pysisyphus.calculators.Dimer import Dimer
+        from pysisyphus.optimizers.PreconLBFGS import PreconLBFGS
+
+        nimages = len(self.images)
+        hei_index = self.get_hei_index(last_energies)
+        band_indices = [i for i in self.moving_indices if i != hei_index]
+        if (
+            (last_forces.size != nimages * self.coords_length)
+            or (hei_index not in self.moving_indices)
+            or (len(band_indices) == 0)
+        ):
+            return False
+
+        max_forces = np.abs(last_forces.reshape(nimages, -1)).max(axis=1)
+        ci_max_force = max_forces[hei_index]
+        band_max_force = max_forces[band_indices].max()
+        if ci_max_force >= self.ci_mmf_after * band_max_force:
+            return False
+
+        msg = (
+            f"max(|force|)={ci_max_force:.6f} of CI {hei_index} is below "
+            f"{self.ci_mmf_after:.2f} * {band_max_force:.6f}. Refining CI with "
+            f"{self.ci_mmf_nsteps} dimer steps."
+        )
+        self.log(msg)
+        print(msg)
+
+        hei = self.images[hei_index]
+        # The cheap 'simple' tangent does not require energies at the current
+        # coordinates, that are not yet calculated.
+        dimer_kwargs = {
+            "N_raw": self.get_tangent(hei_index, kind="simple", disable_lanczos=True),
+            "base_name": "ci_mmf",
+            "write_orientations": False,
+        }
+        dimer_kwargs.update(self.ci_mmf_dimer_kwargs)
+        dimer = Dimer(hei.calculator, **dimer_kwargs)
+        ci_geom = Geometry(hei.atoms, hei.cart_coords)
+        ci_geom.set_calculator(dimer)
+
+        opt_kwargs = {
+            "max_cycles": self.ci_mmf_nsteps,
+            "prefix": "ci_mmf",
+            "dump": False,
+        }
+        opt_kwargs.update(self.ci_mmf_opt_kwargs)
+        opt = PreconLBFGS(ci_geom, **opt_kwargs)
+        opt.run()
+
+        # Re-embed the refined CI into the band
+        hei.coords = ci_geom.cart_coords
+        self.ci_mmf_done = True
+        return True
+
+    def freeze_converged_images(self, step, energies, forces):
+        """Dynamic convergence of images, as outlined in [2].
+
+        Every moving image i gets its own force threshold
+
+            f_max^i = f_max * (1 + |i_HEI - i| * alpha),
+
+        so images far away from the HEI are considered converged earlier.
+        Called by the optimizer before the step is taken. The step components
+        of converged images are zeroed, so they stay at coordinates where their
+        energy and forces are already known and no calculations are done for
+        them in the next cycle, see restore_frozen_images(). As their forces are
+        still projected with the current tangents and springs, they are released
+        again when their (NEB) forces rise above the threshold. When all images
+        are below their thresholds, no image is frozen, so the whole band can
+        converge w.r.t. the global thresholds.
+        """
+        assert (
+            self.dyn_conv_thresh is not None
+        ), "'dyn_conv_thresh' must be set when 'dyn_conv_alpha' is given!"
+        self.dyn_conv_frozen = list()
+        snapshots = self.image_snapshots
+        nimages = len(self.images)
+        if (
+            (snapshots is None)
+            or (len(snapshots) != nimages)
+            or (forces.size != nimages * self.coords_length)
+            or (step.size != forces.size)
+        ):
+            return step
+
+        max_forces = np.abs(forces.reshape(nimages, -1)).max(axis=1)
+        hei_index = self.get_hei_index(energies)
+        hei_dists = np.abs(np.arange(nimages) - hei_index)
+        threshs = self.dyn_conv_thresh * (1 + hei_dists * self.dyn_conv_alpha)
+        converged = [i for i in self.moving_indices if max_forces[i] < threshs[i]]
+        if len(converged) == len(self.moving_indices):
+            return step
+
+        step = step.copy()
+        image_steps = step.reshape(nimages, -1)
+        image_steps[converged] = 0.0
+        self.dyn_conv_frozen = converged
+        return step
+
+    def restore_frozen_images(self):
+        """Restore energies and forces of frozen images from the previous cycle."""
+        frozen = list()
+        snapshots = self.image_snapshots
+        if (snapshots is None) or (len(snapshots) != len(self.images)):
+            self.dyn_conv_frozen = frozen
+            return
+
+        for i in self.dyn_conv_frozen:
+            cart_coords, energy, cart_forces = snapshots[i]
+            image = self.images[i]
+            # Images may still have been moved, e.g., by a reparametrization.
+            if not np.allclose(image.cart_coords, cart_coords):
+                continue
+            image.energy = energy
+            image.cart_forces = cart_forces
+            frozen.append(i)
+        self.dyn_conv_frozen = frozen
+        if self.dyn_conv_frozen:
+            self.log(f"Skipping calculations for images {self.dyn_conv_frozen}.")
 
     def rms(self, arr):
         """Root mean square
@@ -1,7 +1,7 @@
 # [1] http://aip.scitation.org/doi/abs/10.1063/1.2720838
 
 import numpy as np
-from scipy.interpolate import splprep, splev
+from scipy.interpolate import BSpline, splprep
 
 from pysisyphus.cos.ChainOfStates import ChainOfStates
 
@@ -11,11 +11,21 @@ class SimpleZTS(ChainOfStates):
         self.param = param
         super(SimpleZTS, self).__init__(images, **kwargs)
 
+        # Splines from the last reparametrization, keyed by the coordinates
+        # (and arc length parametrization) they were fitted to.
+        self._splines_key = None
+        self._splines = None
+        # Reused between reparametrizations. Geometry.set_coords() copies
+        # the coordinates, so the images never hold views into it.
+        self._new_points = None
+        # Only changes when the number of images changes.
+        self._uniform_mesh = None
+
     def reparametrize(self):
         def weight_function(mean_energies):
-            mean_energies = np.abs(mean_energies)
-            weights = mean_energies / mean_energies.max()
-            weights = np.sqrt(weights)
+            # sqrt(|E| / max(|E|)) = sqrt(|E|) / max(sqrt(|E|)), as sqrt is monotonic.
+            weights = np.sqrt(np.abs(mean_energies))
+            weights /= weights.max()
             return weights
 
         reshaped = self.coords.reshape(-1, self.coords_length)
@@ -26,20 +36,12 @@ class SimpleZTS(ChainOfStates):
         u = None
         # Energy weighted arc length parametrization.
         if self.param == "energy":
-            energies = [img.energy for img in self.images]
-            mean_energies = [(energies[i] + energies[i-1])/2
-                             for i in range(1, len(self.images))
-            ]
+            energies = self.energy
+            mean_energies = 0.5 * (energies[1:] + energies[:-1])
             weights = weight_function(mean_energies)
-            arc_segments = [0, ]
-            for i in range(1, len(self.images)):
-                coord_diff = np.linalg.norm(
-                    self.images[i].coords - self.images[i-1].coords
-                )
-                next_segment = arc_segments[-1] + weights[i-1]*coord_diff
-                arc_segments.append(next_segment)
-            arc_segments = np.array(arc_segments)
-            arc_segments /= arc_segments.max()
+            coord_diffs = np.linalg.norm(np.diff(reshaped, axis=0), axis=1)
+            arc_segments = np.concatenate(([0.0], np.cumsum(weights * coord_diffs)))
+            arc_segments /= arc_segments[-1]
 
             u = arc_segments
         # Use chunks of 9 dimension because splprep can handle at max
@@ -51,14 +53,29 @@ class SimpleZTS(ChainOfStates):
         # tck, u = splprep(transp_coords, u=u, s=0)
         # uniform_mesh = np.linspace(0, 1, num=len(self.images))
         # new_points = np.array(splev(uniform_mesh, tck))
-        tcks, us = zip(*[splprep(transp_coords[i:i+9], u=u, s=0)
-                         for i in range(0, len(transp_coords), 9)]
-        )
-        uniform_mesh = np.linspace(0, 1, num=len(self.images))
+        #
+        # The tcks are converted to vector-valued BSplines, that directly
+        # yield arrays of shape (len(uniform_mesh), dim) when evaluated.
+        splines_key = (reshaped.tobytes(), None if u is None else u.tobytes())
+        if splines_key == self._splines_key:
+            splines = self._splines
+        else:
+            tcks, us = zip(*[splprep(transp_coords[i:i+9], u=u, s=0)
+                             for i in range(0, len(transp_coords), 9)]
+            )
+            splines = [BSpline(t, np.transpose(c), k) for t, c, k in tcks]
+            self._splines_key = splines_key
+            self._splines = splines
+        if (self._uniform_mesh is None) or (self._uniform_mesh.size != len(self.images)):
+            self._uniform_mesh = np.linspace(0, 1, num=len(self.images))
+        uniform_mesh = self._uniform_mesh
         # Reparametrize mesh
-        new_points = np.vstack([splev(uniform_mesh, tck) for tck in tcks])
-        # Flatten along first dimension.
-        new_points = new_points.reshape(-1, len(self.images))
-        self.coords = new_points.transpose().flatten()
+        shape = (len(self.images), self.coords_length)
+        if (self._new_points is None) or (self._new_points.shape != shape):
+            self._new_points = np.empty(shape)
+        np.concatenate(
+            [spline(uniform_mesh) for spline in splines], axis=1, out=self._new_points
+        )
+        self.coords = self._new_points.reshape(-1)
 
         return True
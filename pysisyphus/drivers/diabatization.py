@@ -2,7 +2,6 @@ import argparse
 import itertools as it
 import sys
 
-import matplotlib.pyplot as plt
 import numpy as np
 import yaml
 
@@ -70,6 +69,8 @@ def diabatize_path(adia_ens, dip_moms, tr_quad_moms=None, epots=None, **kwargs):
 
 
 def plot_dia_res(dia_res, show=False):
+    import matplotlib.pyplot as plt
+
     nstates = dia_res[0].nstates
     adia_ens = np.zeros((len(dia_res), nstates))
     dia_ens = np.zeros((len(dia_res), nstates))
@@ -114,6 +114,8 @@ def run_opt(
     T = opt_kwargs.pop("T", T_DEFAULT)
     p = opt_kwargs.pop("p", p_DEFAULT)
     propagate = opt_kwargs.pop("propagate", False)
+    # Dynamic convergence of COS images; typical value is 0.1
+    dyn_conv_alpha = opt_kwargs.pop("dyn_conv_alpha", None)
 
     opt_cls = get_opt_cls(opt_key)
     for i in range(iterative_max_cycles):
@@ -121,6 +123,11 @@ def run_opt(
         # from the final geometry of the previous optimization.
         if (i > 0) and issubclass(opt_cls, HessianOptimizer):
             opt_kwargs["hessian_init"] = "calc"
+            # The eigensystem belongs to the initial Hessian of the first cycle
+            opt_kwargs.pop("hessian_init_eig", None)
+        # The optimizer derives the default threshold from its own thresholds
+        if is_cos and (dyn_conv_alpha is not None):
+            geom.dyn_conv_alpha = dyn_conv_alpha
         opt = opt_cls(geom, **opt_kwargs)
         print(highlight_text(f"Running {title}", level=level) + "\n")
         print(f"     Input geometry: {geom.describe()}")
@@ -4,7 +4,6 @@ import dataclasses
 from pathlib import Path
 from typing import Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 from numpy.typing import NDArray
 
@@ -146,6 +145,8 @@ def homogeneous_broadening_eV(
 
 
 def plot_spectrum(nm, epsilon, exc_ens_nm=None, fosc=None, show=False):
+    import matplotlib.pyplot as plt
+
     fig, ax = plt.subplots()
     ax.plot(nm, epsilon)
     ax.set_ylabel(r"$\epsilon$")
@@ -27,7 +27,6 @@ from math import exp, pi
 from typing import Callable, Optional
 import sys
 
-import matplotlib.pyplot as plt
 import numpy as np
 from numpy.typing import NDArray
 from numpy.polynomial.laguerre import Laguerre
@@ -254,6 +253,8 @@ def run():
         handle.write("\n".join(xyzs))
 
     if plotekin:
+        import matplotlib.pyplot as plt
+
         half_masses_au = geom.masses * AMU2AU / 2
 
         def E_kin(v_au):
@@ -1,8 +1,6 @@
 import logging
 from pathlib import Path
 
-from distributed import Client
-
 from pysisyphus.helpers import slugify_worker
 
 LOGGERS = {
@@ -42,6 +40,8 @@ def init_logging(log_dir="./", scheduler=None):
     loggers for every worker are prepared."""
     log_path = Path(log_dir)
     if scheduler:
+        from distributed import Client
+
         client = Client(scheduler)
         client.run(init_logging_base, log_path=log_path)
     else:
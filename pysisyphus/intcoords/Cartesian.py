@@ -10,7 +10,7 @@ class Cartesian(Primitive):
         super().__init__(*args, **kwargs)
 
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         return 1
 
     @staticmethod
@@ -6,6 +6,7 @@
 import numpy as np
 
 from pysisyphus.intcoords import RedundantCoords
+from pysisyphus.intcoords.Primitive import Primitive
 from pysisyphus.linalg import gram_schmidt
 
 
@@ -88,8 +89,13 @@ class DLC(RedundantCoords):
         """See [5] between Eq. (7) and Eq. (8) for advice regarding
         the threshold."""
         if self.weighted:
+            # Calculate rho for all atom pairs at once, instead of for every primitive.
+            rho_mat = Primitive.rho_matrix(self.atoms, self.coords3d)
             weights = np.array(
-                [prim.weight(self.atoms, self.coords3d) for prim in self.primitives]
+                [
+                    prim.weight(self.atoms, self.coords3d, rho_mat=rho_mat)
+                    for prim in self.primitives
+                ]
             )
             self.log(
                 "Weighting B-matrix:\n"
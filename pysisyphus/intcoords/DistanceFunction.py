@@ -9,7 +9,7 @@ class DistanceFunction(Primitive):
         super().__init__(indices, **kwargs)
 
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         return 1
 
     @staticmethod
@@ -25,10 +25,10 @@ class LinearBend(Primitive):
         self.cross_vec = None
 
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         m, o, n = indices
-        rho_mo = LinearBend.rho(atoms, coords3d, (m, o))
-        rho_on = LinearBend.rho(atoms, coords3d, (o, n))
+        rho_mo = LinearBend.rho(atoms, coords3d, (m, o), rho_mat)
+        rho_on = LinearBend.rho(atoms, coords3d, (o, n), rho_mat)
 
         # Repeated code to avoid import of intcoords.Bend
         u_dash = coords3d[m] - coords3d[o]
@@ -14,7 +14,7 @@ class LinearDisplacement(Primitive):
         self.cross_vec = None
 
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         raise Exception("Not yet implemented!")
 
     def calculate(self, coords3d, indices=None, gradient=False):
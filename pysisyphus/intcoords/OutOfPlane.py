@@ -12,7 +12,7 @@ class OutOfPlane(Primitive):
     """
 
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         raise Exception("Not yet implemented!")
 
     @staticmethod
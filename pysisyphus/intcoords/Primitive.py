@@ -1,8 +1,9 @@
 import abc
 import logging
-from math import exp
+from math import exp, sqrt
 
 import numpy as np
+from scipy.spatial.distance import pdist, squareform
 
 from pysisyphus.elem_data import COVALENT_RADII as CR
 from pysisyphus.helpers_pure import hash_arr
@@ -16,12 +17,26 @@ class Primitive(metaclass=abc.ABCMeta):
         if calc_kwargs is None:
             calc_kwargs = ()
         self.calc_kwargs = calc_kwargs
+        self._calc_kwargs_dict = None
         self.cache = cache
 
         self.logger = logging.getLogger("internal_coords")
         self.val_cache = {}
         self.grad_cache = {}
 
+    def get_calc_kwargs(self):
+        """Gather calc_kwargs. The dict is built on first use, as subclasses
+        set the attributes after calling Primitive.__init__()."""
+        if self._calc_kwargs_dict is None:
+            self._calc_kwargs_dict = {
+                key: getattr(self, key) for key in self.calc_kwargs
+            }
+        return self._calc_kwargs_dict
+
+    def invalidate_calc_kwargs(self):
+        """Must be called after one of the calc_kwargs attributes was reassigned."""
+        self._calc_kwargs_dict = None
+
     def log(self, msg, lvl=logging.DEBUG):
         self.logger.log(lvl, msg)
 
@@ -30,8 +45,10 @@ class Primitive(metaclass=abc.ABCMeta):
 
     @staticmethod
     def parallel(u, v, thresh=1e-6):
-        dot = u.dot(v) / (norm3(u) * norm3(v))
-        return (1 - abs(dot)) < thresh
+        uv = u[0] * v[0] + u[1] * v[1] + u[2] * v[2]
+        uu = u[0] * u[0] + u[1] * u[1] + u[2] * u[2]
+        vv = v[0] * v[0] + v[1] * v[1] + v[2] * v[2]
+        return (1 - abs(uv) / sqrt(uu * vv)) < thresh
 
     @staticmethod
     def _get_cross_vec(coords3d, indices):
@@ -46,6 +63,7 @@ class Primitive(metaclass=abc.ABCMeta):
 
     def set_cross_vec(self, coords3d, indices):
         self.cross_vec = self._get_cross_vec(coords3d, self.indices)
+        self.invalidate_calc_kwargs()
         self.log(f"Cross vector for {self} set to {self.cross_vec}")
 
     @abc.abstractmethod
@@ -53,19 +71,30 @@ class Primitive(metaclass=abc.ABCMeta):
         pass
 
     @abc.abstractmethod
-    def _weight(self, atoms, coords3d, indices, f_damping):
+    def _weight(self, atoms, coords3d, indices, f_damping, rho_mat=None):
         pass
 
-    def weight(self, atoms, coords3d, f_damping=0.12):
-        return self._weight(atoms, coords3d, self.indices, f_damping)
+    def weight(self, atoms, coords3d, f_damping=0.12, rho_mat=None):
+        return self._weight(atoms, coords3d, self.indices, f_damping, rho_mat=rho_mat)
 
     @staticmethod
-    def rho(atoms, coords3d, indices):
+    def rho(atoms, coords3d, indices, rho_mat=None):
         i, j = indices
+        # Look up precomputed value, see Primitive.rho_matrix().
+        if rho_mat is not None:
+            return rho_mat[i, j]
         distance = norm3(coords3d[i] - coords3d[j])
         cov_rad_sum = CR[atoms[i].lower()] + CR[atoms[j].lower()]
         return exp(-(distance / cov_rad_sum - 1))
 
+    @staticmethod
+    def rho_matrix(atoms, coords3d):
+        """Rho values of all atom pairs at once; see Primitive.rho()."""
+        cov_radii = np.array([CR[atom.lower()] for atom in atoms])
+        cov_rad_sums = cov_radii[:, None] + cov_radii[None, :]
+        distances = squareform(pdist(coords3d))
+        return np.exp(-(distances / cov_rad_sums - 1))
+
     # def calculate(self, coords3d, indices=None, gradient=False):
         # if indices is None:
             # indices = self.indices
@@ -98,14 +127,11 @@ class Primitive(metaclass=abc.ABCMeta):
             except KeyError:
                 self.log_dbg(f"Hash '{cur_hash}' is not yet cached.")
 
-        # Gather calc_kwargs
-        calc_kwargs = {key: getattr(self, key) for key in self.calc_kwargs}
-
         results =  self._calculate(
             coords3d=coords3d,
             indices=indices,
             gradient=gradient,
-            **calc_kwargs,
+            **self.get_calc_kwargs(),
         )
 
         if self.cache:
@@ -121,13 +147,10 @@ class Primitive(metaclass=abc.ABCMeta):
         if indices is None:
             indices = self.indices
 
-        # Gather calc_kwargs
-        calc_kwargs = {key: getattr(self, key) for key in self.calc_kwargs}
-
         return self._jacobian(
             coords3d=coords3d,
             indices=indices,
-            **calc_kwargs,
+            **self.get_calc_kwargs(),
         )
 
     def __str__(self):
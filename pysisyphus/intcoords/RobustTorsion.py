@@ -17,7 +17,7 @@ from pysisyphus.intcoords.derivatives import (
 
 class RobustTorsion1(Primitive):
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         return 1.0
 
     @staticmethod
@@ -39,7 +39,7 @@ class RobustTorsion1(Primitive):
 
 class RobustTorsion2(Primitive):
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         return 1.0
 
     @staticmethod
@@ -33,7 +33,7 @@ class Rotation(Primitive):
         self.ref_coords3d = ref_coords3d.reshape(-1, 3).copy()
 
     @staticmethod
-    def _weight(atoms, coords3d, indices, f_damping):
+    def _weight(atoms, coords3d, indices, f_damping, rho_mat=None):
         return 1
 
     @staticmethod
@@ -3,6 +3,12 @@ import random
 
 import numpy as np
 
+from pysisyphus.intcoords import kernels
+from pysisyphus.intcoords.Bend import Bend
+from pysisyphus.intcoords.Primitive import Primitive
+from pysisyphus.intcoords.Stretch import Stretch
+from pysisyphus.intcoords.Torsion import Torsion
+
 
 class PrimInternal:
     def __init__(self, inds, val, grad=None):
@@ -17,12 +23,51 @@ class PrimInternal:
         return f"PrimInternal({self.inds}, {self.val:.4f})"
 
 
+# Primitives using these methods are evaluated together in one compiled kernel.
+BATCH_KINDS = {
+    Stretch._calculate: kernels.STRETCH,
+    Bend._calculate: kernels.BEND,
+    Torsion._calculate: kernels.TORSION,
+}
+
+
+def get_batch_kind(primitive):
+    prim_cls = type(primitive)
+    if primitive.cache or (prim_cls.calculate is not Primitive.calculate):
+        return None
+    return BATCH_KINDS.get(prim_cls._calculate, None)
+
+
 def eval_primitives(coords3d, primitives):
-    prim_internals = list()
-    for primitive in primitives:
+    prim_internals = [None] * len(primitives)
+    batch_inds = list()
+    batch_kinds = list()
+    batch_indices = list()
+    for i, primitive in enumerate(primitives):
+        kind = get_batch_kind(primitive)
+        if kind is not None:
+            batch_inds.append(i)
+            batch_kinds.append(kind)
+            indices = primitive.indices
+            batch_indices.append(indices + [-1] * (4 - len(indices)))
+            continue
         value, gradient = primitive.calculate(coords3d, gradient=True)
-        prim_internal = PrimInternal(primitive.indices, value, gradient)
-        prim_internals.append(prim_internal)
+        prim_internals[i] = PrimInternal(primitive.indices, value, gradient)
+
+    if batch_inds:
+        nbatch = len(batch_inds)
+        vals = np.empty(nbatch)
+        grads = np.zeros((nbatch, *coords3d.shape))
+        kernels.eval_batch(
+            np.ascontiguousarray(coords3d, dtype=float),
+            np.array(batch_kinds, dtype=np.int64),
+            np.array(batch_indices, dtype=np.int64),
+            vals,
+            grads,
+        )
+        grads = grads.reshape(nbatch, -1)
+        for i, val, grad in zip(batch_inds, vals, grads):
+            prim_internals[i] = PrimInternal(primitives[i].indices, val, grad)
     return prim_internals
 
 
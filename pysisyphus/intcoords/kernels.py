@@ -0,0 +1,244 @@
+"""Compiled kernels for the most common primitive internal coordinates.
+
+The kernels are compiled with numba, when it is installed. Otherwise they
+are plain python functions, yielding identical results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    HAS_NUMBA = True
+except ModuleNotFoundError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """Dummy decorator, so the kernels can be used without numba."""
+        # Called as @njit
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+
+        # Called as @njit(...)
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+@njit(cache=True, error_model="numpy")
+def _norm3(a):
+    return np.sqrt(a[0] * a[0] + a[1] * a[1] + a[2] * a[2])
+
+
+@njit(cache=True, error_model="numpy")
+def _dot3(a, b):
+    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+
+
+@njit(cache=True, error_model="numpy")
+def _cross3(a, b):
+    return np.array(
+        (
+            a[1] * b[2] - a[2] * b[1],
+            a[2] * b[0] - a[0] * b[2],
+            a[0] * b[1] - a[1] * b[0],
+        )
+    )
+
+
+@njit(cache=True, error_model="numpy")
+def _parallel(u, v, thresh=1e-6):
+    uv = _dot3(u, v)
+    uu = _dot3(u, u)
+    vv = _dot3(v, v)
+    return (1 - abs(uv) / np.sqrt(uu * vv)) < thresh
+
+
+@njit(cache=True, error_model="numpy")
+def stretch_value(coords3d, n, m):
+    return _norm3(coords3d[m] - coords3d[n])
+
+
+@njit(cache=True, error_model="numpy")
+def stretch_grad(coords3d, n, m, row):
+    """Bond length and its gradient. The gradient is written into 'row'.
+
+    'row' has the same shape as 'coords3d' and must be zeroed."""
+    bond = coords3d[m] - coords3d[n]
+    bond_length = _norm3(bond)
+    bond_normed = bond / bond_length
+    # 1 / -1 correspond to the sign factor [1] Eq. 18
+    row[m] = bond_normed
+    row[n] = -bond_normed
+    return bond_length
+
+
+@njit(cache=True, error_model="numpy")
+def bend_value(coords3d, m, o, n):
+    u_dash = coords3d[m] - coords3d[o]
+    v_dash = coords3d[n] - coords3d[o]
+    u = u_dash / _norm3(u_dash)
+    v = v_dash / _norm3(v_dash)
+    udv = max(-1.0, min(1.0, _dot3(u, v)))
+    return np.arccos(udv)
+
+
+@njit(cache=True, error_model="numpy")
+def bend_grad(coords3d, m, o, n, row):
+    """Bend angle and its gradient. See stretch_grad()."""
+    u_dash = coords3d[m] - coords3d[o]
+    v_dash = coords3d[n] - coords3d[o]
+    u_norm = _norm3(u_dash)
+    v_norm = _norm3(v_dash)
+    u = u_dash / u_norm
+    v = v_dash / v_norm
+
+    udv = max(-1.0, min(1.0, _dot3(u, v)))
+    angle_rad = np.arccos(udv)
+
+    cross_vec1 = np.array((1.0, -1.0, 1.0))
+    cross_vec2 = np.array((-1.0, 1.0, 1.0))
+
+    # Determine second vector for the cross product, to get an
+    # orthogonal direction. Eq. (24) in [1]
+    if not _parallel(u, v):
+        cross_vec = v
+    elif not _parallel(u, cross_vec1):
+        cross_vec = cross_vec1
+    else:
+        cross_vec = cross_vec2
+
+    w_dash = _cross3(u, cross_vec)
+    w = w_dash / _norm3(w_dash)
+
+    uxw = _cross3(u, w)
+    wxv = _cross3(w, v)
+
+    #                  |  m  |  n  |  o  |
+    # -----------------------------------
+    # sign_factor(amo) |  1  |  0  | -1  | first_term
+    # sign_factor(ano) |  0  |  1  | -1  | second_term
+    first_term = uxw / u_norm
+    second_term = wxv / v_norm
+    row[m] = first_term
+    row[o] = -first_term - second_term
+    row[n] = second_term
+    return angle_rad
+
+
+@njit(cache=True, error_model="numpy")
+def _torsion(coords3d, m, o, p, n, row, gradient):
+    u_dash = coords3d[m] - coords3d[o]
+    v_dash = coords3d[n] - coords3d[p]
+    w_dash = coords3d[p] - coords3d[o]
+    u_norm = _norm3(u_dash)
+    v_norm = _norm3(v_dash)
+    w_norm = _norm3(w_dash)
+    u = u_dash / u_norm
+    v = v_dash / v_norm
+    w = w_dash / w_norm
+    phi_u = np.arccos(_dot3(u, w))
+    phi_v = np.arccos(-_dot3(w, v))
+    uxw = _cross3(u, w)
+    vxw = _cross3(v, w)
+    cos_dihed = _dot3(uxw, vxw) / (np.sin(phi_u) * np.sin(phi_v))
+    # Restrict cos_dihed to the allowed interval for arccos [-1, 1]
+    cos_dihed = min(1.0, max(cos_dihed, -1.0))
+
+    dihedral_rad = np.arccos(cos_dihed)
+
+    # Arccos only returns values between 0 and π, but dihedrals can
+    # also be negative. This is corrected now.
+    #
+    # (v ⨯ w) · u will be < 0 when both vectors point in different directions.
+    #
+    #  M  --->   N
+    #  ^        ^
+    #   \      /
+    #    u    v    positive dihedral, M rotates into N clockwise
+    #     \  /     (v ⨯ w) · u > 0, keep positive sign
+    #      OwP
+    #              w points downward, into the screen plane.
+    #              The vector resulting from the cross-product is easily
+    #              visualized with your right hand.
+    #
+    #  M
+    #   \
+    #  | u
+    #  |  \
+    #  |   OwP     negative dihedral, M rotates into N counter-clockwise
+    #  v  /        (v ⨯ w) · u < 0, invert dihedral sign
+    #    v
+    #   /
+    #  N
+    #
+    if (dihedral_rad != np.pi) and (_dot3(vxw, u) < 0):
+        dihedral_rad *= -1
+
+    if gradient:
+        #                  |  m  |  n  |  o  |  p  |
+        # ------------------------------------------
+        # sign_factor(amo) |  1  |  0  | -1  |  0  | 1st term
+        # sign_factor(apn) |  0  | -1  |  0  |  1  | 2nd term
+        # sign_factor(aop) |  0  |  0  |  1  | -1  | 3rd term
+        # sign_factor(apo) |  0  |  0  | -1  |  1  | 4th term
+        sin2_u = np.sin(phi_u) ** 2
+        sin2_v = np.sin(phi_v) ** 2
+        first_term = uxw / (u_norm * sin2_u)
+        second_term = vxw / (v_norm * sin2_v)
+        third_term = uxw * np.cos(phi_u) / (w_norm * sin2_u)
+        fourth_term = -vxw * np.cos(phi_v) / (w_norm * sin2_v)
+        row[m] = first_term
+        row[n] = -second_term
+        row[o] = -first_term + third_term - fourth_term
+        row[p] = second_term - third_term + fourth_term
+    return dihedral_rad
+
+
+@njit(cache=True, error_model="numpy")
+def torsion_value(coords3d, m, o, p, n):
+    return _torsion(coords3d, m, o, p, n, np.empty((0, 3)), False)
+
+
+@njit(cache=True, error_model="numpy")
+def torsion_grad(coords3d, m, o, p, n, row):
+    """Dihedral angle and its gradient. See stretch_grad()."""
+    return _torsion(coords3d, m, o, p, n, row, True)
+
+
+# Kinds of primitives that can be evaluated by eval_batch()
+STRETCH = 0
+BEND = 1
+TORSION = 2
+
+
+@njit(cache=True, error_model="numpy")
+def eval_batch(coords3d, kinds, indices, vals, grads):
+    """Evaluate many primitives and their gradients in one call.
+
+    Parameters
+    ----------
+    coords3d
+        2d array of shape (natoms, 3) holding the Cartesian coordinates.
+    kinds
+        1d integer array of shape (nprims, ), holding STRETCH, BEND or TORSION.
+    indices
+        2d integer array of shape (nprims, 4). Unused trailing indices are ignored.
+    vals
+        1d array of shape (nprims, ), that is filled with the primitive values.
+    grads
+        3d array of shape (nprims, natoms, 3), that is filled with the gradients.
+        Must be zeroed.
+    """
+    for i in range(kinds.size):
+        kind = kinds[i]
+        inds = indices[i]
+        if kind == STRETCH:
+            vals[i] = stretch_grad(coords3d, inds[0], inds[1], grads[i])
+        elif kind == BEND:
+            vals[i] = bend_grad(coords3d, inds[0], inds[1], inds[2], grads[i])
+        else:
+            vals[i] = torsion_grad(
+                coords3d, inds[0], inds[1], inds[2], inds[3], grads[i]
+            )
@@ -8,14 +8,17 @@ import itertools as it
 from typing import Optional
 
 import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import pdist, squareform
-from sklearn.cluster import KMeans
 
 from pysisyphus.constants import BOHR2ANG
 from pysisyphus.config import BEND_MIN_DEG, DIHED_MAX_DEG
 from pysisyphus.helpers_pure import log, sort_by_central, merge_sets
 from pysisyphus.elem_data import VDW_RADII, COVALENT_RADII as CR
 from pysisyphus.intcoords import Stretch, Bend, LinearBend, Torsion
+from pysisyphus.intcoords.Primitive import Primitive
 from pysisyphus.intcoords.setup_fast import find_bonds as find_bonds_fast
 from pysisyphus.intcoords.PrimTypes import PrimTypes, PrimMap, Rotations
 from pysisyphus.intcoords.valid import bend_valid, dihedral_valid
@@ -25,9 +28,10 @@ BOND_FACTOR = 1.3
 
 
 def get_pair_covalent_radii(atoms):
-    atoms = [a.lower() for a in atoms]
     cov_radii = np.array([CR[a.lower()] for a in atoms])
-    pair_cov_radii = np.array([r1 + r2 for r1, r2 in it.combinations(cov_radii, 2)])
+    # Same order as it.combinations(range(len(atoms)), 2)
+    from_, to_ = np.triu_indices(len(atoms), k=1)
+    pair_cov_radii = cov_radii[from_] + cov_radii[to_]
     return pair_cov_radii
 
 
@@ -42,17 +46,29 @@ def get_bond_sets(
     atoms, coords3d, bond_factor=BOND_FACTOR, return_cdm=False, return_cbm=False
 ):
     """I'm sorry, but this function does not return sets, but an int ndarray."""
+    coords3d = np.reshape(coords3d, (-1, 3))
+    # When the distance matrix is not requested, only pairs of atoms closer than
+    # the biggest possible bond length are considered. They are found with a KD-tree,
+    # avoiding the quadratic number of atom pairs.
+    if not (return_cdm or return_cbm):
+        cov_radii = np.array([CR[atom.lower()] for atom in atoms])
+        max_bond_dist = bond_factor * 2 * cov_radii.max()
+        pairs = cKDTree(coords3d).query_pairs(max_bond_dist, output_type="ndarray")
+        from_, to_ = pairs.T
+        dists = np.linalg.norm(coords3d[from_] - coords3d[to_], axis=1)
+        bond_inds = pairs[dists <= bond_factor * (cov_radii[from_] + cov_radii[to_])]
+        # Sort, so the bonds appear in the same order as in the condensed bond matrix
+        bond_inds = bond_inds[np.lexsort(bond_inds.T[::-1])]
+        return bond_inds.astype(int)
+
     cdm = pdist(coords3d)
     # Generate indices corresponding to the atom pairs in the
     # condensed distance matrix cdm.
-    atom_inds = list(it.combinations(range(len(coords3d)), 2))
-    atom_inds = np.array(atom_inds, dtype=int)
+    atom_inds = np.stack(np.triu_indices(len(coords3d), k=1), axis=1)
     scaled_cr_sums = bond_factor * get_pair_covalent_radii(atoms)
     # condensed bond matrix
     cbm = cdm <= scaled_cr_sums
     bond_inds = atom_inds[cbm]
-    if not return_cbm and not return_cdm:
-        return bond_inds
     add_returns = tuple(
         [mat for flag, mat in ((return_cdm, cdm), (return_cbm, cbm)) if flag]
     )
@@ -72,6 +88,26 @@ def get_fragments(atoms, coords, bond_inds=None, bond_factor=BOND_FACTOR):
     return fragments
 
 
+def get_fragment_inds(natoms, bond_inds):
+    """Sorted atom indices of all bonded fragments.
+
+    Fragments are determined as connected components of the bond graph and are
+    ordered by their lowest atom index. Like get_fragments() this misses
+    unconnected single atoms."""
+    bond_inds = np.asarray(bond_inds, dtype=int).reshape(-1, 2)
+    graph = coo_matrix(
+        (np.ones(len(bond_inds)), (bond_inds[:, 0], bond_inds[:, 1])),
+        shape=(natoms, natoms),
+    )
+    _, fragment_ids = connected_components(graph, directed=False)
+    bonded = np.zeros(natoms, dtype=bool)
+    bonded[bond_inds.flatten()] = True
+    # Stable sort keeps the atom indices in every fragment sorted.
+    order = np.argsort(fragment_ids, kind="stable")
+    splits = np.cumsum(np.bincount(fragment_ids))[:-1]
+    return [frag for frag in np.split(order, splits) if bonded[frag[0]]]
+
+
 def connect_fragments(
     cdm, fragments, max_aux=3.78, aux_factor=BOND_FACTOR, logger=None
 ):
@@ -237,6 +273,9 @@ def connect_fragments_kmeans(
     distance to filter all interfragment bonds.
     """
     if len(fragments) > 2:
+        # Imported here, as importing sklearn is slow.
+        from sklearn.cluster import KMeans
+
         dists = np.reshape(interfrag_dists, (-1, 1))
         min_dist = dists.min()
 
@@ -682,11 +721,17 @@ def setup_redundant(
     }
     mobile_org_inds = set(freeze_map.values())
 
+    # rho values for all atom pairs, used in the weight calculation.
+    rho_mat = None if (min_weight is None) else Primitive.rho_matrix(atoms, coords3d)
+
     def keep_coord(prim_cls, prim_inds):
         return (
             True
             if (min_weight is None)
-            else (prim_cls._weight(atoms, coords3d, prim_inds, 0.12) >= min_weight)
+            else (
+                prim_cls._weight(atoms, coords3d, prim_inds, 0.12, rho_mat=rho_mat)
+                >= min_weight
+            )
         )
 
     def keep_coords(prims, prim_cls):
@@ -2,7 +2,6 @@ import itertools as it
 import logging
 
 import numpy as np
-from sklearn.neighbors import KDTree
 
 from pysisyphus.elem_data import COVALENT_RADII as CR
 from pysisyphus.helpers_pure import log, timed
@@ -40,6 +39,9 @@ def find_bonds(
 
     max_bond_dists = get_max_bond_dists(atoms, bond_factor, covalent_radii=cr)
     radii = bond_factor * (cr.copy() + max(cr))
+    # Imported here, as importing sklearn is slow.
+    from sklearn.neighbors import KDTree
+
     kdt = KDTree(c3d)
     res, dists = kdt.query_radius(c3d, radii, return_distance=True)
     bonds_ = list()
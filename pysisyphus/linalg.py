@@ -153,14 +153,16 @@ def finite_difference_hessian(
     coords: NDArray[float],
     grad_func: Callable[[NDArray[float]], NDArray[float]],
     step_size: float = 1e-2,
-    acc: Literal[2, 4] = 2,
+    acc: Literal[1, 2, 4] = 2,
     callback: Optional[Callable] = None,
 ) -> NDArray[float]:
     """Numerical Hessian from central finite gradient differences.
 
     See central differences in
       https://en.wikipedia.org/wiki/Finite_difference_coefficient
-    for the different accuracies.
+    for the different accuracies. acc=1 uses forward differences instead,
+    requiring only one displaced gradient per coordinate, plus the gradient
+    at the reference coordinates.
     """
     if callback is None:
 
@@ -168,6 +170,7 @@ def finite_difference_hessian(
             pass
 
     accuracies = {
+        1: ((-1.0, 0), (1.0, 1)),  # 1 calculation + reference gradient
         2: ((-0.5, -1), (0.5, 1)),  # 2 calculations
         4: ((1 / 12, -2), (-2 / 3, -1), (2 / 3, 1), (-1 / 12, 2)),  # 4 calculations
     }
@@ -176,22 +179,27 @@ def finite_difference_hessian(
 
     size = coords.size
     fd_hessian = np.zeros((size, size))
-    zero_step = np.zeros(size)
+    # Only one component is non-zero at a time, so the step is updated in place.
+    step = np.zeros(size)
 
     coeffs = accuracies[acc]
-    for i, _ in enumerate(coords):
-        step = zero_step.copy()
-        step[i] = step_size
-
-        def get_grad(factor, displ, j):
-            displ_coords = coords + step * displ
-            callback(i, j)
-            grad = grad_func(displ_coords)
-            return factor * grad
+    # The undisplaced gradient is shared by all coordinates, so it is only
+    # calculated once.
+    if acc == 1:
+        ref_grad = grad_func(coords)
 
-        grads = [get_grad(factor, displ, j) for j, (factor, displ) in enumerate(coeffs)]
-        fd = np.sum(grads, axis=0) / step_size
-        fd_hessian[i] = fd
+    for i in range(size):
+        step[i] = step_size
+        # Accumulate the weighted gradients directly in the Hessian row
+        for j, (factor, displ) in enumerate(coeffs):
+            if displ == 0:
+                grad = ref_grad
+            else:
+                callback(i, j)
+                grad = grad_func(coords + step * displ)
+            fd_hessian[i] += factor * grad
+        step[i] = 0.0
+    fd_hessian /= step_size
 
     # Symmetrize
     fd_hessian = (fd_hessian + fd_hessian.T) / 2
@@ -255,6 +255,18 @@ class Optimizer(metaclass=abc.ABCMeta):
         )
         for key, value in self.convergence.items():
             setattr(self, key, value)
+        # Threshold for the dynamic convergence of COS images, when not given
+        if (
+            self.is_cos
+            and (self.geometry.dyn_conv_alpha is not None)
+            and (self.geometry.dyn_conv_thresh is None)
+        ):
+            try:
+                dyn_conv_thresh = self.convergence["max_force_thresh"]
+            # Same relation between the thresholds as in make_conv_dict()
+            except KeyError:
+                dyn_conv_thresh = 1.5 * self.convergence["rms_force_thresh"]
+            self.geometry.dyn_conv_thresh = dyn_conv_thresh
 
         if self.thresh == "never":
             max_cycles = 1_000_000_000
@@ -835,6 +847,11 @@ class Optimizer(metaclass=abc.ABCMeta):
 
             if self.is_cos:
                 self.tangents.append(self.geometry.get_tangents().flatten())
+                # Converged images are not moved, see freeze_converged_images()
+                if self.geometry.dyn_conv_alpha is not None:
+                    step = self.geometry.freeze_converged_images(
+                        step, self.energies[-1], self.forces[-1]
+                    )
 
             self.steps.append(step)
 
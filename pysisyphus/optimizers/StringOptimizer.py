@@ -49,6 +49,8 @@ class StringOptimizer(Optimizer):
         self.s_list = list()
         self.y_list = list()
         self.inds = list()
+        # Squared norm of the forces from the previous cycle
+        self.prev_forces_dot = None
 
     def prepare_opt(self):
         if self.align and self.is_cart_opt:
@@ -57,11 +59,19 @@ class StringOptimizer(Optimizer):
     def reset(self):
         pass
 
+    def _get_opt_restart_info(self):
+        opt_restart_info = {
+            "prev_forces_dot": self.prev_forces_dot,
+        }
+        return opt_restart_info
+
+    def _set_opt_restart_info(self, opt_restart_info):
+        self.prev_forces_dot = opt_restart_info.get("prev_forces_dot", None)
+
     def restrict_step_components(self, steps):
-        too_big = np.abs(steps) > self.max_step
-        self.log(f"Found {np.sum(too_big)} big step components.")
-        signs = np.sign(steps[too_big])
-        steps[too_big] = signs * self.max_step
+        too_big = np.count_nonzero(np.abs(steps) > self.max_step)
+        self.log(f"Found {too_big} big step components.")
+        np.clip(steps, -self.max_step, self.max_step, out=steps)
         return steps
 
     def check_convergence(self, *args, **kwargs):
@@ -89,6 +99,7 @@ class StringOptimizer(Optimizer):
             self.log("Aligned string.")
 
         forces = self.geometry.forces
+        forces_dot = forces.dot(forces)
         self.energies.append(self.geometry.energy)
         self.forces.append(forces)
 
@@ -152,16 +163,21 @@ class StringOptimizer(Optimizer):
         )
         lbfgs_lists_empty = (len(self.s_list) == 0) and (len(self.y_list) == 0)
         if previous_step_with_same_size and lbfgs_lists_empty:
-            prev_forces = self.forces[-2]
             # Fletcher-Reeves
             kind = "Fletcher-Reeves"
-            beta = forces.dot(forces) / prev_forces.dot(prev_forces)
+            # Not set when restarted from information without it
+            if self.prev_forces_dot is None:
+                prev_forces = self.forces[-2]
+                self.prev_forces_dot = prev_forces.dot(prev_forces)
+            beta = forces_dot / self.prev_forces_dot
             # Polak-Ribiere
             # kind = "Polak-Ribiere"
-            # beta = forces.dot(forces - prev_forces) / prev_forces.dot(prev_forces)
+            # prev_forces = self.forces[-2]
+            # beta = forces.dot(forces - prev_forces) / self.prev_forces_dot
             beta = min(beta, 1)
             step = forces + beta * self.steps[-1]
             self.log(f"{kind} conjugate gradient correction, β={beta:.6f}")
+        self.prev_forces_dot = float(forces_dot)
 
         if self.scale_step == "global":
             step = scale_by_max_step(step, self.max_step)
@@ -4,7 +4,6 @@ from math import sqrt
 from pprint import pprint
 
 import numpy as np
-import sympy as sym
 
 from pysisyphus.helpers_pure import log
 
@@ -48,6 +47,7 @@ def gen_solutions():
         a4 = 3/8 * a3**2 / a2
     Using (1) - (5) we can solve the set of equations for a0 - a4.
     """
+    import sympy as sym
 
     e0, e1, g0, g1, a0, a1, a2, a3 = sym.symbols("e0 e1 g0 g1 a:4")
 
@@ -1,20 +1,26 @@
 import argparse
-from collections import namedtuple
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import copy
 import datetime
+import fnmatch
+import hashlib
 import itertools as it
 import os
 from math import modf
+import operator
 from pathlib import Path
+import pickle
 import platform
 from pprint import pprint
 import re
 import shutil
 import sys
+import tempfile
 import textwrap
 import time
+from types import MappingProxyType
 
-from distributed import Client
 import numpy as np
 import scipy as sp
 import yaml
@@ -52,7 +58,6 @@ from pysisyphus.helpers import (
 )
 from pysisyphus.helpers_pure import (
     find_closest_sequence,
-    merge_sets,
     recursive_update,
     highlight_text,
     approx_float,
@@ -63,7 +68,7 @@ from pysisyphus.intcoords.setup import get_bond_mat
 from pysisyphus.init_logging import init_logging
 from pysisyphus.intcoords.PrimTypes import PrimTypes, normalize_prim_inputs
 from pysisyphus.intcoords.helpers import form_coordinate_union
-from pysisyphus.intcoords.setup import get_bond_sets
+from pysisyphus.intcoords.setup import get_bond_sets, get_fragment_inds
 from pysisyphus.interpolate import interpolate_all
 from pysisyphus.irc import *
 from pysisyphus.io import save_hessian
@@ -182,9 +187,19 @@ def parse_args(args):
     parser.add_argument(
         "--scheduler", default=None, help="Address of the dask scheduler."
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Use/write a '.yaml.pkl' cache of the parsed YAML input. The cache "
+        "is only used when the YAML input is unchanged.",
+    )
     return parser.parse_args()
 
 
+# Values of these types in calculator kwargs are copied before creating a calculator
+MUTABLE_TYPES = (dict, list, set, np.ndarray)
+
+
 def get_calc_closure(base_name, calc_key, calc_kwargs, iter_dict=None, index=None):
     if iter_dict is None:
         iter_dict = dict()
@@ -205,7 +220,12 @@ def get_calc_closure(base_name, calc_key, calc_kwargs, iter_dict=None, index=Non
     def calc_getter(**add_kwargs):
         nonlocal index
 
-        kwargs_copy = copy.deepcopy(calc_kwargs)
+        # Only containers have to be copied, as some calculators modify
+        # nested dicts, e.g. by popping 'type'. Immutable values are shared.
+        kwargs_copy = {
+            key: copy.deepcopy(val) if isinstance(val, MUTABLE_TYPES) else val
+            for key, val in calc_kwargs.items()
+        }
 
         # Some calculators are just wrappers, modifying forces from actual calculators,
         # e.g. AFIR and Dimer. If we find one of the keys in 'calc_map' in 'calc_kwargs'
@@ -245,19 +265,20 @@ def run_tsopt_from_cos(
 ):
     print(highlight_text(f"Running TS-optimization from COS"))
 
-    # Later want a Cartesian HEI tangent, so if not already present we create
-    # a Cartesian COS object to obtain the tangent from.
+    # Later want a Cartesian HEI tangent. If the COS was not optimized in
+    # Cartesians the tangent is calculated directly from the stacked Cartesian
+    # coordinates and energies of the images.
     atoms = cos.images[0].atoms
     if cos.coord_type != "cart":
-        cart_images = list()
-        for image in cos.images:
-            cart_image = Geometry(atoms, image.cart_coords)
-            cart_image.energy = image.energy
-            cart_images.append(cart_image)
-        cart_cos = ChainOfStates.ChainOfStates(cart_images)
+        cart_coords = cos.image_cart_coords
+        energies = cos.energy
+
+        def get_cart_tangent(i):
+            return ChainOfStates.get_cart_tangent(cart_coords, energies, i)
+
     # Just continue using the Cartesian COS object
     else:
-        cart_cos = cos
+        get_cart_tangent = cos.get_tangent
 
     hei_kind = tsopt_kwargs.pop("hei_kind", "splined")
     # Use plain, unsplined, HEI
@@ -265,7 +286,7 @@ def run_tsopt_from_cos(
         hei_index = cos.get_hei_index()
         hei_image = cos.images[hei_index]
         # Select the Cartesian tangent from the COS
-        cart_hei_tangent = cart_cos.get_tangent(hei_index)
+        cart_hei_tangent = get_cart_tangent(hei_index)
     # Use splined HEI
     elif hei_kind == "splined":
         # The splined HEI tangent is usually very bady for the purpose of
@@ -287,8 +308,8 @@ def run_tsopt_from_cos(
         # Indices of the two nearest images with integer indices.
         floor = int(floor)
         ceil = floor + 1
-        floor_tangent = cart_cos.get_tangent(floor)
-        ceil_tangent = cart_cos.get_tangent(ceil)
+        floor_tangent = get_cart_tangent(floor)
+        ceil_tangent = get_cart_tangent(ceil)
         print(f"Creating mixed HEI tangent, using tangents at images {(floor, ceil)}.")
         print("Overlap of splined HEI tangent with these tangents:")
         for ind, tang in ((floor, floor_tangent), (ceil, ceil_tangent)):
@@ -365,7 +386,7 @@ def run_tsopt_from_cos(
     #
     # Cartesian tangent and an animated .trj file
     cart_hei_fn = "cart_hei_tangent"
-    np.savetxt(cart_hei_fn, cart_hei_tangent)
+    np.save(cart_hei_fn + ".npy", cart_hei_tangent)
     trj = get_tangent_trj_str(
         ts_geom.atoms, ts_geom.cart_coords, cart_hei_tangent, points=10
     )
@@ -426,6 +447,9 @@ def run_tsopt_from_cos(
         # Continue Hessian in whatever coordinate system is actually in use
         H = ts_geom.hessian
         eigvals, eigvecs = np.linalg.eigh(H)
+        # Pass the eigensystem on, so the TS optimizer does not have to
+        # diagonalize the same Hessian again.
+        tsopt_kwargs["hessian_init_eig"] = (eigvals, eigvecs)
         neg_inds = eigvals < -1e-4
         if sum(neg_inds) == 0:
             raise Exception("No negative eigenvalues found at splined HEI. Exiting!")
@@ -433,7 +457,7 @@ def run_tsopt_from_cos(
         print(f"Negative eigenvalues at splined HEI:\n{eigval_str}")
         neg_eigvals = eigvals[neg_inds]
         neg_eigvecs = eigvecs.T[neg_inds]
-        ovlps = [np.abs(imag_mode.dot(ref_tangent)) for imag_mode in neg_eigvecs]
+        ovlps = np.abs(neg_eigvecs @ ref_tangent)
         print("Overlaps between HEI tangent and imaginary modes:")
         for i, ov in enumerate(ovlps):
             print(f"\t{i:02d}: {ov:.6f}")
@@ -443,11 +467,11 @@ def run_tsopt_from_cos(
             f"Imaginary mode {max_ovlp_ind} has highest overlap ({max_ovlp:.2%}) "
             "with splined HEI tangent."
         )
-        rel_ovlps = np.array(ovlps) / max(ovlps)
+        rel_ovlps = ovlps / max_ovlp
         similar_inds = rel_ovlps > 0.80
         # Only 1 big overlap is present
         if (max_ovlp >= ovlp_thresh) and (similar_inds.sum() == 1):
-            ovlp_root = np.argmax(ovlps)
+            ovlp_root = max_ovlp_ind
         # Multiple big and similar overlaps are present.
         elif (max_ovlp >= ovlp_thresh) and (similar_inds.sum() > 1):
             # Will yield the first occurence of True, which corresponds to a
@@ -513,20 +537,97 @@ def run_tsopt_from_cos(
     return opt_result
 
 
+def dump_calculation_results(geom, results):
+    """Dump results of the latest calculation on 'geom' to JSON & HDF5."""
+    # results dict of MultiCalc will contain keys that can be dumped yet. So
+    # we skip the JSON dumping when KeyError is raised.
+    try:
+        as_json = results_to_json(results)
+        calc = geom.calculator
+        # Decrease counter, because it will be increased by 1, w.r.t to the
+        # calculation.
+        json_fn = calc.make_fn("results", counter=calc.calc_counter - 1)
+        with open(json_fn, "w") as handle:
+            handle.write(as_json)
+    except KeyError:
+        print("Skipped JSON dump of calculation results!")
+
+    hess_keys = [
+        key
+        for key, val in results.items()
+        if isinstance(val, dict) and "hessian" in val
+    ]
+    for hkey in hess_keys:
+        hres = results[hkey]
+        hfn = f"{hkey}_hessian.h5"
+        save_hessian(
+            hfn,
+            geom,
+            cart_hessian=hres["hessian"],
+            energy=hres["energy"],
+        )
+        print(f"Dumped hessian to '{hfn}'.")
+
+
+def run_calculation(geom, func_name="run_calculation"):
+    """Run calculation on 'geom' and dump its results.
+
+    Defined at module level, so it can be used in a ProcessPoolExecutor."""
+    results = getattr(geom.calculator, func_name)(geom.atoms, geom.cart_coords)
+    dump_calculation_results(geom, results)
+    return results
+
+
+def run_calculation_in_process(geom, func_name="run_calculation"):
+    """Run calculation on 'geom' in a separate process.
+
+    The calculator is a copy of the one in the parent process. So besides
+    the results, its counter, kept files and chkfiles are returned, so they
+    can be set on the original calculator."""
+    results = run_calculation(geom, func_name)
+    calc = geom.calculator
+    calc_state = {
+        key: getattr(calc, key)
+        for key in ("calc_counter", "kept_history")
+        if hasattr(calc, key)
+    }
+    try:
+        chkfiles = calc.get_chkfiles()
+    except AttributeError:
+        chkfiles = None
+    return results, calc_state, chkfiles
+
+
+def run_calculation_chain(geoms, func_name="run_calculation"):
+    """Run calculations on 'geoms' one after another.
+
+    The chkfiles of every calculator are set on the next calculator, so they
+    can be used as initial guess. Defined at module level, so it can be
+    submitted to a dask cluster."""
+    all_results = list()
+    for i, geom in enumerate(geoms):
+        if i > 0:
+            try:
+                geom.calculator.set_chkfiles(geoms[i - 1].calculator.get_chkfiles())
+            except AttributeError:
+                pass
+        results = getattr(geom.calculator, func_name)(geom.atoms, geom.cart_coords)
+        all_results.append(results)
+    return all_results
+
+
 def run_calculations(
     geoms,
     calc_getter,
     scheduler=None,
     assert_track=False,
     run_func=None,
+    max_workers=1,
 ):
     print(highlight_text("Running calculations"))
 
     func_name = "run_calculation" if run_func is None else run_func
 
-    def par_calc(geom):
-        return getattr(geom.calculator, func_name)(geom.atoms, geom.coords)
-
     for geom in geoms:
         geom.set_calculator(calc_getter())
 
@@ -535,10 +636,68 @@ def run_calculations(
             [geom.calculator.track for geom in geoms]
         ), "'track: True' must be present in calc section."
 
+    # Use as many processes as possible, taking into account the number of
+    # cores every calculator uses by itself.
+    if max_workers == "auto":
+        pal = getattr(geoms[0].calculator, "pal", 1)
+        max_workers = max(1, (os.cpu_count() or 1) // pal)
+    max_workers = min(int(max_workers), len(geoms))
+    # Geometries and their calculators are sent to the worker processes as
+    # pickles. Fall back to serial calculations when this is not possible.
+    if (max_workers > 1) and not scheduler:
+        try:
+            pickle.dumps(geoms)
+        except Exception as err:
+            print(f"Can't pickle calculators ({err}). Running calculations serially.")
+            max_workers = 1
+
     if scheduler:
-        client = Client(scheduler, pure=False, silence_logs=False)
-        results_futures = client.map(par_calc, geoms)
-        all_results = client.gather(results_futures)
+        from distributed import Client
+
+        try:
+            client = Client(scheduler, pure=False, silence_logs=False)
+        # Newer versions of distributed reject these keywords when connecting
+        # to an existing scheduler.
+        except ValueError:
+            client = Client(scheduler)
+        # Submit one chain of consecutive geometries per worker, so chkfiles
+        # can be reused between neighbouring geometries.
+        nworkers = max(1, len(client.scheduler_info()["workers"]))
+        chains = [
+            chain.tolist()
+            for chain in np.array_split(np.arange(len(geoms)), nworkers)
+            if chain.size > 0
+        ]
+        chain_futures = [
+            client.submit(
+                run_calculation_chain,
+                [geoms[i] for i in chain],
+                func_name,
+                pure=False,
+            )
+            for chain in chains
+        ]
+        all_results = list(it.chain(*client.gather(chain_futures)))
+    # Independent calculations in separate processes, on copies of the
+    # calculators. chkfiles are not propagated between the calculators in this
+    # case, but the state of the copies is set on the original calculators.
+    elif max_workers > 1:
+        print(f"Running {len(geoms)} calculations in {max_workers} processes.")
+        start = time.time()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            proc_results = list(
+                executor.map(run_calculation_in_process, geoms, it.repeat(func_name))
+            )
+        all_results = list()
+        for geom, (results, calc_state, chkfiles) in zip(geoms, proc_results):
+            all_results.append(results)
+            calc = geom.calculator
+            for key, value in calc_state.items():
+                setattr(calc, key, value)
+            if chkfiles is not None:
+                calc.set_chkfiles(chkfiles)
+        diff = time.time() - start
+        print(f"Calculations took {diff:.1f} s.\n")
     else:
         all_results = list()
         i_fmt = "02d"
@@ -547,36 +706,7 @@ def run_calculations(
 
             start = time.time()
             print(geom)
-            results = getattr(geom.calculator, func_name)(geom.atoms, geom.cart_coords)
-            # results dict of MultiCalc will contain keys that can be dumped yet. So
-            # we skip the JSON dumping when KeyError is raised.
-            try:
-                as_json = results_to_json(results)
-                calc = geom.calculator
-                # Decrease counter, because it will be increased by 1, w.r.t to the
-                # calculation.
-                json_fn = calc.make_fn("results", counter=calc.calc_counter - 1)
-                with open(json_fn, "w") as handle:
-                    handle.write(as_json)
-            except KeyError:
-                print("Skipped JSON dump of calculation results!")
-
-            hess_keys = [
-                key
-                for key, val in results.items()
-                if isinstance(val, dict) and "hessian" in val
-            ]
-            for hkey in hess_keys:
-                hres = results[hkey]
-                hfn = f"{hkey}_hessian.h5"
-                save_hessian(
-                    hfn,
-                    geom,
-                    cart_hessian=hres["hessian"],
-                    energy=hres["energy"],
-                )
-                print(f"Dumped hessian to '{hfn}'.")
-
+            results = run_calculation(geom, func_name)
             all_results.append(results)
             if i < (len(geoms) - 1):
                 try:
@@ -880,9 +1010,6 @@ def run_endopt(irc, endopt_key, endopt_kwargs, calc_getter):
         coords = irc.all_coords[-1]
         to_opt.append((coords, "downhill"))
 
-    def to_frozensets(sets):
-        return [frozenset(_) for _ in sets]
-
     separate_fragments = endopt_kwargs.pop("fragments", False)
     total = separate_fragments in ("total", False)
 
@@ -898,9 +1025,9 @@ def run_endopt(irc, endopt_key, endopt_kwargs, calc_getter):
 
         # Detect separate fragments if requested.
         if separate_fragments:
-            bond_sets = to_frozensets(get_bond_sets(atoms.tolist(), c3d))
-            # Sort atom indices, so the atoms don't become totally scrambled.
-            fragments.extend([sorted(frag) for frag in merge_sets(bond_sets)])
+            bond_sets = get_bond_sets(atoms.tolist(), c3d)
+            # Atom indices are sorted, so the atoms don't become totally scrambled.
+            fragments.extend(get_fragment_inds(len(atoms), bond_sets))
             # Disable higher fragment counts. I'm looking forward to the day
             # this ever occurs and someone complains :)
             assert len(fragments) < 10, "Something probably went wrong"
@@ -919,7 +1046,7 @@ def run_endopt(irc, endopt_key, endopt_kwargs, calc_getter):
             # Dummy fragment containing all atom indices.
             fragments.extend(
                 [
-                    range(len(atoms)),
+                    np.arange(len(atoms)),
                 ]
             )
             fragment_names.extend(
@@ -934,7 +1061,7 @@ def run_endopt(irc, endopt_key, endopt_kwargs, calc_getter):
             )
 
         fragment_keys = [key] * len(fragments)
-        fragment_atoms = [tuple(atoms[list(frag)]) for frag in fragments]
+        fragment_atoms = [tuple(atoms[frag]) for frag in fragments]
         fragment_coords = [c3d[frag].flatten() for frag in fragments]
         fragments_to_opt.extend(
             list(zip(fragment_keys, fragment_names, fragment_atoms, fragment_coords))
@@ -1056,6 +1183,27 @@ def copy_yaml_and_geometries(run_dict, yaml_fn, dest_and_add_cp, new_yaml_fn=Non
     print("\t", yaml_fn)
 
 
+# Default optimizer settings for molecular optimizations and COS optimizations.
+# Temperature and pressure are added in get_defaults(). Only immutable values
+# are allowed here, so shallow copies of these templates are sufficient.
+MOL_OPT_DEFAULTS = MappingProxyType(
+    {
+        "dump": True,
+        "max_cycles": 150,
+        "overachieve_factor": 5,
+        "type": "rfo",
+        "do_hess": False,
+    }
+)
+COS_OPT_DEFAULTS = MappingProxyType(
+    {
+        "type": "qm",
+        "align": True,
+        "dump": True,
+    }
+)
+
+
 def get_defaults(conf_dict, T_default=T_DEFAULT, p_default=p_DEFAULT):
     # Defaults
     dd = {
@@ -1084,19 +1232,10 @@ def get_defaults(conf_dict, T_default=T_DEFAULT, p_default=p_DEFAULT):
     }
 
     mol_opt_defaults = {
-        "dump": True,
-        "max_cycles": 150,
-        "overachieve_factor": 5,
-        "type": "rfo",
-        "do_hess": False,
+        **MOL_OPT_DEFAULTS,
         "T": T_default,
         "p": p_default,
     }
-    cos_opt_defaults = {
-        "type": "qm",
-        "align": True,
-        "dump": True,
-    }
     if "interpol" in conf_dict:
         dd["interpol"] = {
             "align": True,
@@ -1108,7 +1247,7 @@ def get_defaults(conf_dict, T_default=T_DEFAULT, p_default=p_DEFAULT):
             "fix_first": True,
             "fix_last": True,
         }
-        dd["opt"] = cos_opt_defaults.copy()
+        dd["opt"] = dict(COS_OPT_DEFAULTS)
     # Use a different, more powerful, optimizer when we are not dealing
     # with a COS-optimization.
     elif "opt" in conf_dict:
@@ -1234,52 +1373,57 @@ def get_defaults(conf_dict, T_default=T_DEFAULT, p_default=p_DEFAULT):
     return dd
 
 
-def get_last_calc_cycle():
-    def keyfunc(path):
-        return re.match(r"image_\d+.(\d+).out", str(path))[1]
+CALC_LOG_RE = re.compile(r"image_\d+\.(\d+)\.out$")
+
 
+def get_last_calc_cycle():
     cwd = Path(".")
-    calc_logs = [str(cl) for cl in cwd.glob("image_*.*.out")]
-    calc_logs = sorted(calc_logs, key=keyfunc)
-    grouped = it.groupby(calc_logs, key=keyfunc)
+    # Number of calculator logs per calculation cycle
+    cycle_lengths = Counter(
+        int(mobj[1])
+        for calc_log in cwd.glob("image_*.*.out")
+        if (mobj := CALC_LOG_RE.match(calc_log.name))
+    )
     # Find the last completly finished cycle.
     last_length = 0
     last_calc_cycle = 0
-    for calc_cycle, group in grouped:
-        cycle_length = len(list(group))
+    for calc_cycle in sorted(cycle_lengths):
+        cycle_length = cycle_lengths[calc_cycle]
         if cycle_length < last_length:
             # When this is True we have a cycle that has less
             # items than last one, that is an unfinished cycle.
             break
         last_length = cycle_length
-        last_calc_cycle = int(calc_cycle)
+        last_calc_cycle = calc_cycle
     if last_calc_cycle == 0:
         print("Can't find any old calculator logs.")
     print(f"Last calculation counter is {last_calc_cycle}.")
     return last_calc_cycle
 
 
-VALID_KEYS = {
-    "assert",
-    "afir",
-    "barriers",
-    "calc",
-    "cos",
-    "endopt",
-    "geom",
-    "interpol",
-    "irc",
-    "md",
-    "mdp",
-    "opt",
-    "perf",
-    "precontr",
-    "preopt",
-    "scan",
-    "shake",
-    "stocastic",
-    "tsopt",
-}
+VALID_KEYS = frozenset(
+    {
+        "assert",
+        "afir",
+        "barriers",
+        "calc",
+        "cos",
+        "endopt",
+        "geom",
+        "interpol",
+        "irc",
+        "md",
+        "mdp",
+        "opt",
+        "perf",
+        "precontr",
+        "preopt",
+        "scan",
+        "shake",
+        "stocastic",
+        "tsopt",
+    }
+)
 
 
 def setup_run_dict(run_dict):
@@ -1289,10 +1433,10 @@ def setup_run_dict(run_dict):
     run_dict = get_defaults(run_dict)
     # Update nested entries that are dicts by themselves
     # Take care to insert a , after the string!
-    key_set = set(org_dict.keys())
+    key_set = org_dict.keys()
     assert (
         key_set <= VALID_KEYS
-    ), f"Found invalid keys in YAML input: {key_set - VALID_KEYS}"
+    ), f"Found invalid keys in YAML input: {set(key_set - VALID_KEYS)}"
     for key in key_set & VALID_KEYS:
         try:
             # Recursive update, because there may be nested dicts
@@ -1319,6 +1463,15 @@ RunResult = namedtuple(
 )
 
 
+def pop_type(section):
+    """Split a run_dict section into its 'type' and the remaining kwargs.
+
+    Returns (None, None) for sections that are not present."""
+    if not section:
+        return None, None
+    return section.pop("type"), section
+
+
 def main(run_dict, restart=False, yaml_dir="./", scheduler=None):
 
     # Dump run_dict
@@ -1327,42 +1480,41 @@ def main(run_dict, restart=False, yaml_dir="./", scheduler=None):
     with open("RUN.yaml", "w") as handle:
         yaml.dump(run_dict_copy, handle)
 
-    if run_dict["interpol"]:
-        interpol_key = run_dict["interpol"].pop("type")
-        interpol_kwargs = run_dict["interpol"]
+    # Results that are collected into RunResult. They stay None when the
+    # corresponding step is not carried out.
+    preopt_first_geom = preopt_last_geom = None
+    cos = cos_opt = None
+    ts_geom = ts_opt = None
+    end_geoms = irc = irc_geom = None
+    mdp_result = None
+    opt_geom = opt = None
+    calced_geoms = calced_results = None
+    stocastic = None
+    scan_geoms = scan_vals = scan_energies = None
+    perf_results = None
+
+    interpol_key, interpol_kwargs = pop_type(run_dict["interpol"])
     # Preoptimization prior to COS optimization
-    if run_dict["preopt"]:
-        preopt_key = run_dict["preopt"].pop("type")
-        preopt_kwargs = run_dict["preopt"]
+    preopt_key, preopt_kwargs = pop_type(run_dict["preopt"])
     # Optimization of fragments after IRC integration
-    if run_dict["endopt"]:
-        endopt_key = run_dict["endopt"].pop("type")
-        endopt_kwargs = run_dict["endopt"]
-    if run_dict["opt"]:
-        opt_key = run_dict["opt"].pop("type")
-        opt_kwargs = run_dict["opt"]
-    if run_dict["cos"]:
-        cos_key = run_dict["cos"].pop("type")
-        cos_kwargs = run_dict["cos"]
+    endopt_key, endopt_kwargs = pop_type(run_dict["endopt"])
+    opt_key, opt_kwargs = pop_type(run_dict["opt"])
+    cos_key, cos_kwargs = pop_type(run_dict["cos"])
+    if cos_kwargs is not None:
         cos_kwargs["scheduler"] = scheduler
-    if run_dict["stocastic"]:
-        stoc_key = run_dict["stocastic"].pop("type")
-        stoc_kwargs = run_dict["stocastic"]
-    if run_dict["tsopt"]:
-        tsopt_key = run_dict["tsopt"].pop("type")
-        tsopt_kwargs = run_dict["tsopt"]
-    if run_dict["irc"]:
-        irc_key = run_dict["irc"].pop("type")
-        irc_kwargs = run_dict["irc"]
-    if run_dict["afir"]:
-        afir_key = run_dict["afir"].pop("type")
-        afir_kwargs = run_dict["afir"]
+    stoc_key, stoc_kwargs = pop_type(run_dict["stocastic"])
+    tsopt_key, tsopt_kwargs = pop_type(run_dict["tsopt"])
+    irc_key, irc_kwargs = pop_type(run_dict["irc"])
+    afir_key, afir_kwargs = pop_type(run_dict["afir"])
 
     # Handle geometry input. This section must always be present.
     geom_kwargs = run_dict["geom"]
     xyz = geom_kwargs.pop("fn")
     coord_type = geom_kwargs.pop("type")
     union = geom_kwargs.pop("union", None)
+    # Initial loading of geometries from file(s). This is done only once, as
+    # some calculators also require the geometries for their setup.
+    geoms = get_geoms(xyz, coord_type="cart")
 
     ####################
     # CALCULATOR SETUP #
@@ -1372,15 +1524,15 @@ def main(run_dict, restart=False, yaml_dir="./", scheduler=None):
     calc_key = run_dict["calc"].pop("type")
     calc_kwargs = run_dict["calc"]
     calc_run_func = calc_kwargs.pop("run_func", None)
+    # Number of processes used for independent calculations in run_calculations()
+    calc_max_workers = calc_kwargs.pop("max_workers", 1)
     calc_kwargs["out_dir"] = calc_kwargs.get("out_dir", yaml_dir / OUT_DIR_DEFAULT)
     calc_base_name = calc_kwargs.get("base_name", "calculator")
     if calc_key in ("oniom", "ext"):
-        geoms = get_geoms(xyz, quiet=True)
         iter_dict = {
-            "geom": iter(geoms),
+            "geom": iter([geom.copy() for geom in geoms]),
         }
     elif calc_key == "multi":
-        geoms = get_geoms(xyz, quiet=True)
         iter_dict = {
             "base_name": iter([geom.name for geom in geoms]),
         }
@@ -1410,9 +1562,6 @@ def main(run_dict, restart=False, yaml_dir="./", scheduler=None):
     # GEOMETRY SETUP #
     ##################
 
-    # Initial loading of geometries from file(s)
-    geoms = get_geoms(xyz, coord_type="cart")
-
     # ------------------------+
     #   Preconditioning of   |
     # Translation & Rotation |
@@ -1664,14 +1813,35 @@ def main(run_dict, restart=False, yaml_dir="./", scheduler=None):
     # Fallback when no specific job type was specified
     else:
         calced_geoms, calced_results = run_calculations(
-            geoms, calc_getter, scheduler, run_func=calc_run_func
+            geoms,
+            calc_getter,
+            scheduler,
+            run_func=calc_run_func,
+            max_workers=calc_max_workers,
         )
 
-    # We can't use locals() in the dict comprehension, as it runs in its own
-    # local scope.
-    locals_ = locals()
-    results = {key: locals_.get(key, None) for key in RunResult._fields}
-    run_result = RunResult(**results)
+    run_result = RunResult(
+        preopt_first_geom=preopt_first_geom,
+        preopt_last_geom=preopt_last_geom,
+        cos=cos,
+        cos_opt=cos_opt,
+        ts_geom=ts_geom,
+        ts_opt=ts_opt,
+        end_geoms=end_geoms,
+        irc=irc,
+        irc_geom=irc_geom,
+        mdp_result=mdp_result,
+        opt_geom=opt_geom,
+        opt=opt,
+        calced_geoms=calced_geoms,
+        calced_results=calced_results,
+        stocastic=stocastic,
+        calc_getter=calc_getter,
+        scan_geoms=scan_geoms,
+        scan_vals=scan_vals,
+        scan_energies=scan_energies,
+        perf_results=perf_results,
+    )
     return run_result
 
 
@@ -1679,14 +1849,12 @@ def check_asserts(results, run_dict):
     print(highlight_text(f"Asserting results"))
 
     assert_ = run_dict["assert"]
-    keys = list(assert_.keys())
-    objs_attrs = [key.split(".") for key in keys]
-    ref_vals = [assert_[k] for k in keys]
     matches = list()
-    for i, ((obj, attr), ref_val) in enumerate(zip(objs_attrs, ref_vals)):
-        cur_val = getattr(getattr(results, obj), attr)
+    for i, (key, ref_val) in enumerate(assert_.items()):
+        # Keys are dotted attribute paths, e.g. 'opt_geom.energy'
+        cur_val = operator.attrgetter(key)(results)
         matched = approx_float(cur_val, ref_val)
-        print(f"{i:02d}: {obj}.{attr}")
+        print(f"{i:02d}: {key}")
         print(f"\tReference: {ref_val}")
         print(f"\t  Current: {cur_val}")
         print(f"\t  Matches: {bool_color(matched)}")
@@ -1696,164 +1864,180 @@ def check_asserts(results, run_dict):
     print()
 
 
+RM_GLOBS = (
+    "cycle*.trj",
+    "interpolated.trj",
+    "interpolated.image*.xyz",
+    "calculator.log",
+    "optimizer.log",
+    "tsoptimizer.log",
+    "wfoverlap.log",
+    "host_*.calculator.log",
+    "host_*.wfoverlap.log",
+    "wfo_*.out" "optimization.trj",
+    "cos.log",
+    "*.gradient",
+    "optimizer_results.yaml",
+    # ORCA specific
+    "*.orca.gbw",
+    "*.orca.cis",
+    "*.orca.engrad",
+    "*.orca.hessian",
+    "*.orca.inp",
+    "*.orca.hess",
+    "*.orca.molden",
+    # OpenMOLCAS specific
+    "calculator*.out",
+    "calculator*.JobIph",
+    "calculator*.RasOrb",
+    "*rasscf.molden",
+    # Turbomole specific
+    "calculator_*.control",
+    "calculator_*.coord",
+    "calculator_*.mos",
+    "calculator_*.ciss_a",
+    "calculator*.sing_a",
+    "*wavefunction.molden",
+    "*input.xyz",
+    "*.coord",
+    # PySCF specific
+    "calculator*.chkfile",
+    "*.pyscf.out",
+    "*.chkfile",
+    # WFOverlap specific
+    "wfo_*.*.out",
+    # XTB specific
+    "image*.grad",
+    "calculator*.grad",
+    "calculator*.xcontrol",
+    "calculator*.charges",
+    "image_*",
+    "splined_ts_guess.xyz",
+    "splined_hei_tangent",
+    "cart_hei_tangent.trj",
+    "dimer_ts.xyz",
+    "dimer_pickle",
+    "interpolated.geom_*.xyz",
+    # Wavefunction overlap
+    "wfo_*",
+    "image*.molden",
+    "jmol.spt",
+    "overlap_data.h5",
+    "*_CDD.png",
+    "*_CDD.cub",
+    "internal_coords.log",
+    "hei_tangent",
+    "optimization.trj",
+    "splined_hei.xyz",
+    "ts_opt.xyz",
+    "final_geometry.xyz",
+    "calculated_init_hessian",
+    "cur_out",
+    # HDF5 files
+    "optimization.h5",
+    "afir.h5",
+    # Optimization files
+    "*_optimization.trj",
+    # Preopt files
+    "first_*",
+    "last_*",
+    # TSOpt
+    "rsirfo*",
+    # IRC files
+    "irc_*",
+    "irc.log",
+    "finished_*",
+    # IRC/Endopt files
+    "backward_*",
+    "forward_*",
+    # Misc
+    "*imaginary_mode_*.trj",
+    "cart_hei_tangent",
+    "cart_hei_tangent.npy",
+    "ts_calculated_init_cart_hessian",
+    "calculated_final_cart_hessian",
+    "*final_geometry.xyz",
+    "*final_geometries.trj",
+    "current_geometry.xyz",
+    "*current_geometries.trj",
+    "hess_calc_cyc*.h5",
+    "ts_hess_calc_cyc*.h5",
+    "hess_init_irc.h5",
+    "final_hessian.h5",
+    "ts_current_geometry.xyz",
+    "dimer_*",
+    "plain_hei_tangent",
+    "plain_hei.xyz",
+    "hess_calc_irc*.h5",
+    "rebuilt_primitives.xyz",
+    "RUN.yaml",
+    "middle_for_preopt.trj",
+    "relaxed_scan.trj",
+    "too_similar.trj",
+    # MDP
+    "mdp_ee_ascent.trj",
+    "mdp_ee_fin_*.trj",
+    "mdp_ee_init_*.trj",
+    "aligned.geom*xyz",
+    "cos_hei.trj",
+    # Dimer
+    "calculator_*.N",
+    "calculator_*.N.npy",
+    "calculator_*.N.trj",
+    "dimer.log",
+    "*.gfnff_topo",
+    # DFTB+
+    "*.detailed.out",
+    "*.geometry.gen",
+    "*.dftb_in.hsd",
+    "*.EXC.DAT",
+    "*.XplusY.DAT",
+    "*.dftb.out",
+    "rsprfo_*",
+    "reparametrized.trj",
+    "end_geoms_and_ts.trj",
+    "left_ts_right_geoms.trj",
+    "ts_final_hessian.h5",
+    "third_deriv.h5",
+    "*.ao_ovlp_rec",
+    # MOPAC
+    "*.mopac.aux",
+    "*.mopac.arc",
+    "*.mopac.mop",
+    "*.mopac.out",
+)
+# Single regex for all globs, so the cwd is only listed once when cleaning
+RM_REGEX = re.compile("|".join(fnmatch.translate(glob) for glob in RM_GLOBS))
+
+
 def do_clean(force=False):
     """Deletes files from previous runs in the cwd.
     A similar function could be used to store everything ..."""
     cwd = Path(".").resolve()
-    rm_globs = (
-        "cycle*.trj",
-        "interpolated.trj",
-        "interpolated.image*.xyz",
-        "calculator.log",
-        "optimizer.log",
-        "tsoptimizer.log",
-        "wfoverlap.log",
-        "host_*.calculator.log",
-        "host_*.wfoverlap.log",
-        "wfo_*.out" "optimization.trj",
-        "cos.log",
-        "*.gradient",
-        "optimizer_results.yaml",
-        # ORCA specific
-        "*.orca.gbw",
-        "*.orca.cis",
-        "*.orca.engrad",
-        "*.orca.hessian",
-        "*.orca.inp",
-        "*.orca.hess",
-        "*.orca.molden",
-        # OpenMOLCAS specific
-        "calculator*.out",
-        "calculator*.JobIph",
-        "calculator*.RasOrb",
-        "*rasscf.molden",
-        # Turbomole specific
-        "calculator_*.control",
-        "calculator_*.coord",
-        "calculator_*.mos",
-        "calculator_*.ciss_a",
-        "calculator*.sing_a",
-        "*wavefunction.molden",
-        "*input.xyz",
-        "*.coord",
-        # PySCF specific
-        "calculator*.chkfile",
-        "*.pyscf.out",
-        "*.chkfile",
-        # WFOverlap specific
-        "wfo_*.*.out",
-        # XTB specific
-        "image*.grad",
-        "calculator*.grad",
-        "calculator*.xcontrol",
-        "calculator*.charges",
-        "image_*",
-        "splined_ts_guess.xyz",
-        "splined_hei_tangent",
-        "cart_hei_tangent.trj",
-        "dimer_ts.xyz",
-        "dimer_pickle",
-        "interpolated.geom_*.xyz",
-        # Wavefunction overlap
-        "wfo_*",
-        "image*.molden",
-        "jmol.spt",
-        "overlap_data.h5",
-        "*_CDD.png",
-        "*_CDD.cub",
-        "internal_coords.log",
-        "hei_tangent",
-        "optimization.trj",
-        "splined_hei.xyz",
-        "ts_opt.xyz",
-        "final_geometry.xyz",
-        "calculated_init_hessian",
-        "cur_out",
-        # HDF5 files
-        "optimization.h5",
-        "afir.h5",
-        # Optimization files
-        "*_optimization.trj",
-        # Preopt files
-        "first_*",
-        "last_*",
-        # TSOpt
-        "rsirfo*",
-        # IRC files
-        "irc_*",
-        "irc.log",
-        "finished_*",
-        # IRC/Endopt files
-        "backward_*",
-        "forward_*",
-        # Misc
-        "*imaginary_mode_*.trj",
-        "cart_hei_tangent",
-        "ts_calculated_init_cart_hessian",
-        "calculated_final_cart_hessian",
-        "*final_geometry.xyz",
-        "*final_geometries.trj",
-        "current_geometry.xyz",
-        "*current_geometries.trj",
-        "hess_calc_cyc*.h5",
-        "ts_hess_calc_cyc*.h5",
-        "hess_init_irc.h5",
-        "final_hessian.h5",
-        "ts_current_geometry.xyz",
-        "dimer_*",
-        "plain_hei_tangent",
-        "plain_hei.xyz",
-        "hess_calc_irc*.h5",
-        "rebuilt_primitives.xyz",
-        "RUN.yaml",
-        "middle_for_preopt.trj",
-        "relaxed_scan.trj",
-        "too_similar.trj",
-        # MDP
-        "mdp_ee_ascent.trj",
-        "mdp_ee_fin_*.trj",
-        "mdp_ee_init_*.trj",
-        "aligned.geom*xyz",
-        "cos_hei.trj",
-        # Dimer
-        "calculator_*.N",
-        "calculator_*.N.trj",
-        "dimer.log",
-        "*.gfnff_topo",
-        # DFTB+
-        "*.detailed.out",
-        "*.geometry.gen",
-        "*.dftb_in.hsd",
-        "*.EXC.DAT",
-        "*.XplusY.DAT",
-        "*.dftb.out",
-        "rsprfo_*",
-        "reparametrized.trj",
-        "end_geoms_and_ts.trj",
-        "left_ts_right_geoms.trj",
-        "ts_final_hessian.h5",
-        "third_deriv.h5",
-        "*.ao_ovlp_rec",
-        # MOPAC
-        "*.mopac.aux",
-        "*.mopac.arc",
-        "*.mopac.mop",
-        "*.mopac.out",
-    )
-    to_rm_paths = list()
-    for glob in rm_globs:
-        to_rm_paths.extend(list(cwd.glob(glob)))
+    with os.scandir(cwd) as entries:
+        to_rm_paths = sorted(
+            entry.path for entry in entries if RM_REGEX.match(entry.name)
+        )
     to_rm_strs = [str(p) for p in to_rm_paths]
     for s in to_rm_strs:
         print(s)
 
+    def remove(path):
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
     def delete():
-        for p in to_rm_paths:
-            try:
-                os.remove(p)
-                print(f"Deleted {p}")
-            except FileNotFoundError:
-                pass
+        if to_rm_paths:
+            # Removal is dominated by syscall latency, so use threads.
+            max_workers = min(32, len(to_rm_paths))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                removed = list(executor.map(remove, to_rm_paths))
+            for p, p_removed in zip(to_rm_paths, removed):
+                if p_removed:
+                    print(f"Deleted {p}")
         try:
             os.unlink("cur_out")
         except FileNotFoundError:
@@ -1970,7 +2154,6 @@ def run_from_dict(
     # Load defaults etc.
     if set_defaults:
         run_dict = setup_run_dict(run_dict)
-    sys.stdout.flush()
 
     if cp:
         copy_yaml_and_geometries(run_dict, yaml_fn, cp)
@@ -1988,6 +2171,7 @@ def run_from_dict(
     run_dict_without_none = {k: v for k, v in run_dict.items() if v is not None}
     pprint(run_dict_without_none)
     print()
+    # Flush once before the actual (long-running) calculations start.
     sys.stdout.flush()
 
     run_result = main(run_dict, restart, cwd, scheduler)
@@ -1999,13 +2183,56 @@ def run_from_dict(
     return run_result
 
 
-def load_run_dict(yaml_fn):
-    with open(yaml_fn) as handle:
-        yaml_str = handle.read()
+def get_yaml_hash(yaml_fn):
+    with open(yaml_fn, "rb") as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+def load_cached_run_dict(cache_fn, yaml_hash):
+    """Return run_dict from a pickle cache, if it was created from the same YAML."""
+    try:
+        with open(cache_fn, "rb") as handle:
+            cache = pickle.load(handle)
+        if cache["yaml_hash"] != yaml_hash:
+            return None
+        run_dict = cache["run_dict"]
+    except Exception:
+        return None
+    if not isinstance(run_dict, dict):
+        return None
+    return run_dict
+
+
+def dump_cached_run_dict(cache_fn, yaml_hash, run_dict):
+    """Atomically write run_dict and the hash of its YAML to a pickle cache."""
+    cache = {
+        "yaml_hash": yaml_hash,
+        "run_dict": run_dict,
+    }
+    cache_dir = os.path.dirname(os.path.abspath(cache_fn))
+    fd, tmp_fn = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            pickle.dump(cache, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_fn, cache_fn)
+    except BaseException:
+        os.remove(tmp_fn)
+        raise
+
+
+def load_run_dict(yaml_fn, use_cache=False):
+    cache_fn = str(yaml_fn) + ".pkl"
+    if use_cache:
+        yaml_hash = get_yaml_hash(yaml_fn)
+        if (run_dict := load_cached_run_dict(cache_fn, yaml_hash)) is not None:
+            return run_dict
+
     try:
         loader = get_loader()
         try:
-            run_dict = yaml.load(yaml_str, Loader=loader)
+            # The loader reads directly from the file, without an intermediate str.
+            with open(yaml_fn) as handle:
+                run_dict = yaml.load(handle, Loader=loader)
         except yaml.constructor.ConstructorError as err:
             mobj = re.compile(r"for the tag '\!(\w+)'").search(err.problem)
             if mobj:
@@ -2022,6 +2249,13 @@ def load_run_dict(yaml_fn):
         if not (yaml_fn.lower().endswith(".yaml")):
             print("Are you sure that you supplied a YAML file?")
         sys.exit(1)
+
+    if use_cache:
+        try:
+            dump_cached_run_dict(cache_fn, yaml_hash, run_dict)
+        # Caching is optional, e.g., the YAML may reside in a read-only directory.
+        except OSError:
+            pass
     return run_dict
 
 
@@ -2034,7 +2268,7 @@ def run():
     yaml_dir = Path(".")
 
     if args.yaml:
-        run_dict = load_run_dict(args.yaml)
+        run_dict = load_run_dict(args.yaml, use_cache=args.cache)
         yaml_dir = Path(os.path.abspath(args.yaml)).parent
     elif args.bibtex:
         print_bibtex()
@@ -20,6 +20,7 @@ Maybe implement something like this to make test access easier
 
 _reason = "Calculator {} is not available."
 _using_cache = dict()
+_available_cache = dict()
 # Python modules to be imported using importlib.import_module
 IMPORT_DICT = {
     "dftd4": "dftd4",
@@ -53,13 +54,9 @@ class DummyMark:
         self.args = (available, )
 
 
-def using(calculator, set_pytest_mark=True):
-    """Calling disabling set_pytest_mark avoids a runtime dependency on pytest."""
-    calculator = calculator.lower()
-
-    if calculator not in _using_cache:
-        available = False
-
+def calculator_available(calculator):
+    """Check once per calculator if its command or python module is available."""
+    if calculator not in _available_cache:
         # Look into .pysisyphusrc first
         try:
             cmd = Config[calculator]["cmd"]
@@ -80,14 +77,21 @@ def using(calculator, set_pytest_mark=True):
         # Handling native python packages from here
         else:
             available = module_available(calculator)
+        _available_cache[calculator] = available
+    return _available_cache[calculator]
+
 
+def using(calculator, set_pytest_mark=True):
+    """Calling disabling set_pytest_mark avoids a runtime dependency on pytest."""
+    calculator = calculator.lower()
+    skipif = not calculator_available(calculator)
+
+    if not set_pytest_mark:
+        return DummyMark(skipif)
+
+    if calculator not in _using_cache:
         reason = _reason.format(calculator)
-        skipif = not available
-        if set_pytest_mark:
-            mark = pytest.mark.skipif(skipif, reason=reason)
-        else:
-            mark = DummyMark(skipif)
-        _using_cache[calculator] = mark
+        _using_cache[calculator] = pytest.mark.skipif(skipif, reason=reason)
     return _using_cache[calculator]
 
 
@@ -5,7 +5,6 @@ from pathlib import Path
 import re
 import sys
 
-import matplotlib.pyplot as plt
 import numpy as np
 import rmsd as rmsd
 
@@ -644,6 +643,8 @@ def get_interactively(geoms):
             if selection == "q":
                 raise GotNoGeometryException()
             elif selection == "p":
+                import matplotlib.pyplot as plt
+
                 fig, ax = plt.subplots()
                 ax.plot(energies, "o-")
                 ax.set_xlabel("Index")
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 import h5py
 import numpy as np
@@ -28,6 +28,7 @@ class TSHessianOptimizer(HessianOptimizer):
         prim_coord=None,
         rx_coords=None,
         hessian_init: HessInit = "calc",
+        hessian_init_eig: Optional[Tuple[np.ndarray, np.ndarray]] = None,
         hessian_update: HessUpdate = "bofill",
         hessian_recalc_reset: bool = True,
         max_micro_cycles: int = 50,
@@ -68,6 +69,11 @@ class TSHessianOptimizer(HessianOptimizer):
             a model Hessian.
         hessian_init
             Type of initial model Hessian.
+        hessian_init_eig
+            Eigenvalues and eigenvectors of the calculated initial Hessian, as returned
+            by np.linalg.eigh. Avoids a second diagonalization, when the Hessian was
+            already diagonalized, e.g., to select the initial root. Only used with
+            hessian_init="calc".
         hessian_update
             Type of Hessian update. Defaults to BFGS for minimizations and Bofill
             for saddle point searches.
@@ -118,6 +124,7 @@ class TSHessianOptimizer(HessianOptimizer):
             roots = list()
         self.roots = roots
         self.log(f"{self.roots=}")
+        self.hessian_init_eig = hessian_init_eig
         self.hessian_ref = hessian_ref
         try:
             with h5py.File(self.hessian_ref, "r") as handle:
@@ -227,7 +234,17 @@ class TSHessianOptimizer(HessianOptimizer):
         # Determiniation of initial mode either by using a provided
         # reference hessian, or by using a supplied root.
 
-        eigvals, eigvecs = np.linalg.eigh(self.H)
+        # Reuse the provided eigensystem, if the calculated Hessian was not modified.
+        if (
+            (self.hessian_init_eig is not None)
+            and (self.hessian_init == "calc")
+            and (not self.augment_bonds)
+            and (self.hessian_init_eig[1].shape == self.H.shape)
+        ):
+            eigvals, eigvecs = self.hessian_init_eig
+            self.log("Using provided eigensystem of the initial Hessian.")
+        else:
+            eigvals, eigvecs = np.linalg.eigh(self.H)
         neg_inds = eigvals < -self.small_eigval_thresh
         self.log_negative_eigenvalues(eigvals, "Initial ")
 
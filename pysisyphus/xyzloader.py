@@ -5,20 +5,22 @@ import numpy as np
 from pysisyphus.constants import BOHR2ANG
 
 
-def make_xyz_str(atoms, coords, comment=""):
-    assert len(atoms) == len(coords)
-    atoms = [a.capitalize() for a in atoms]
-
-    coord_fmt = "{: 03.8f}"
-    line_fmt = "{:>3s} " + " ".join(
+def get_xyz_body_fmt(atoms):
+    """Format string for the body of a .xyz file, expecting flat coordinates."""
+    coord_fmt = " ".join(
         [
-            coord_fmt,
+            "{: 03.8f}",
         ]
         * 3
     )
+    return "\n".join([f"{atom.capitalize():>3s} {coord_fmt}" for atom in atoms])
 
-    body = [line_fmt.format(a, *xyz) for a, xyz in zip(atoms, coords)]
-    body = "\n".join(body)
+
+def make_xyz_str(atoms, coords, comment="", body_fmt=None):
+    assert len(atoms) == len(coords)
+    if body_fmt is None:
+        body_fmt = get_xyz_body_fmt(atoms)
+    body = body_fmt.format(*np.ravel(coords).tolist())
 
     return f"{len(atoms)}\n{comment}\n{body}"
 
@@ -26,8 +28,10 @@ def make_xyz_str(atoms, coords, comment=""):
 def make_trj_str(atoms, coords_list, comments=None):
     if comments is None:
         comments = ["" for _ in coords_list]
+    # The format string is the same for all frames, so it is only created once.
+    body_fmt = get_xyz_body_fmt(atoms)
     xyz_strings = [
-        make_xyz_str(atoms, coords, comment)
+        make_xyz_str(atoms, coords, comment, body_fmt=body_fmt)
         for coords, comment in zip(coords_list, comments)
     ]
     return "\n".join(xyz_strings)
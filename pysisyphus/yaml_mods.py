@@ -38,7 +38,8 @@ def get_constructor(unit):
 
 
 def get_loader(units=_UNITS):
-    loader = yaml.SafeLoader
+    # Prefer the faster loader from the libyaml bindings, when available.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
     for unit in units:
         tag = f"!{unit}"
         loader.add_constructor(tag, get_constructor(unit))
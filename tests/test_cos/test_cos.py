@@ -5,6 +5,7 @@ import pytest
 from pysisyphus.calculators.AnaPot import AnaPot
 from pysisyphus.calculators.NFK import NFK
 from pysisyphus.calculators.MullerBrownSympyPot import MullerBrownPot
+from pysisyphus.cos.ChainOfStates import ChainOfStates, get_cart_tangent
 from pysisyphus.cos.NEB import NEB
 from pysisyphus.cos.SimpleZTS import SimpleZTS
 from pysisyphus.Geometry import Geometry
@@ -31,8 +32,10 @@ def run_cos_opt(geoms, between, calc_cls, cos_cls, cos_kwargs, opt_cls, opt_kwar
     interpol = Interpolator(geoms, between=between)
     images = interpol.interpolate_all()
 
+    # AnaPot is stateless, so one instance can be shared by all images.
+    calc = AnaPot()
     for image in images:
-        image.set_calculator(AnaPot())
+        image.set_calculator(calc)
 
     cos = cos_cls(images, **cos_kwargs)
 
@@ -127,6 +130,80 @@ def test_anapot_szts(between, param, ref_cycle):
     assert_cos_opt(opt, ref_cycle)
 
 
+def test_anapot_neb_threads():
+    interpol = Interpolator(get_geoms(), between=5)
+    images = interpol.interpolate_all()
+    # Parallel calculations require one calculator per image
+    for image in images:
+        image.set_calculator(AnaPot())
+    neb = NEB(images, k_min=0.01, max_workers=3)
+
+    opt = SteepestDescent(neb)
+    opt.run()
+    # Same cycle as in the serial test_anapot_neb
+    assert_cos_opt(opt, 30)
+
+
+# Without dyn_conv_thresh, max_force_thresh of the optimizer is used (gau_loose).
+@pytest.mark.parametrize("dyn_conv_thresh", (2.5e-3, None))
+def test_anapot_neb_dyn_conv(dyn_conv_thresh):
+    neb_kwargs = {
+        "k_min": 0.01,
+    }
+    ref_opt = run_cos_opt(get_geoms(), 10, AnaPot, NEB, neb_kwargs, SteepestDescent, {})
+    assert_cos_opt(ref_opt, 32)
+    ref_calcs = ref_opt.geometry.images[0].calculator.forces_calcs
+
+    neb_kwargs.update(
+        {
+            "dyn_conv_alpha": 0.1,
+            "dyn_conv_thresh": dyn_conv_thresh,
+        }
+    )
+    opt = run_cos_opt(get_geoms(), 10, AnaPot, NEB, neb_kwargs, SteepestDescent, {})
+    assert_cos_opt(opt, 36)
+    # Calculations for converged images are skipped
+    calcs = opt.geometry.images[0].calculator.forces_calcs
+    assert calcs == 295
+    assert calcs < ref_calcs
+    assert opt.geometry.dyn_conv_thresh == pytest.approx(2.5e-3)
+
+
+def test_anapot_neb_ci_mmf():
+    geoms = get_geoms()
+    neb_kwargs = {
+        "k_min": 0.01,
+        "climb": True,
+        "climb_rms": 0.01,
+        "ci_mmf": True,
+        "ci_mmf_dimer_kwargs": {
+            "rotation_remove_trans": False,
+        },
+        "ci_mmf_opt_kwargs": {
+            "precon": False,
+            "line_search": None,
+            "max_step_element": 0.25,
+        },
+    }
+    opt = run_cos_opt(geoms, 5, AnaPot, NEB, neb_kwargs, SteepestDescent, {})
+    cos = opt.geometry
+    assert cos.ci_mmf_done
+    hei = cos.images[cos.get_hei_index()]
+    # Energy of the actual TS
+    assert hei.energy == pytest.approx(2.80910484, abs=1e-6)
+
+
+def test_get_cart_tangent():
+    geoms = AnaPot().get_path(9)
+    cos = ChainOfStates(geoms)
+    cart_coords = np.array([geom.cart_coords for geom in geoms])
+    energies = np.array([geom.energy for geom in geoms])
+    for i in range(len(geoms)):
+        np.testing.assert_allclose(
+            get_cart_tangent(cart_coords, energies, i), cos.get_tangent(i)
+        )
+
+
 def animate(opt):
     xlim = (-2, 2.5)
     ylim = (0, 5)
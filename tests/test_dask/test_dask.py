@@ -1,10 +1,12 @@
 from distributed import LocalCluster
+import numpy as np
 import pytest
 
 from pysisyphus.cos.NEB import NEB
 from pysisyphus.helpers import geom_loader
 from pysisyphus.calculators import XTB
 from pysisyphus.optimizers.SteepestDescent import SteepestDescent
+from pysisyphus.run import get_calc_closure, run_calculations
 from pysisyphus.testing import using
 
 
@@ -26,3 +28,21 @@ def test_dask():
         opt.run()
 
     assert opt.cur_cycle == (max_cycles - 1)
+
+
+@using("pyscf")
+def test_dask_run_calculations():
+    geoms = geom_loader("lib:ala_dipeptide_iso_b3lyp_631gd_10_images.trj")[:3]
+
+    calc_getter = get_calc_closure("dask", "pyscf", {"basis": "sto3g", "pal": 1})
+
+    with LocalCluster(n_workers=2) as cluster:
+        _, results = run_calculations(
+            geoms, calc_getter, scheduler=cluster.scheduler_address
+        )
+    energies = [res["energy"] for res in results]
+    _, ref_results = run_calculations(
+        [geom.copy() for geom in geoms], calc_getter, max_workers=1
+    )
+    ref_energies = [res["energy"] for res in ref_results]
+    np.testing.assert_allclose(energies, ref_energies)
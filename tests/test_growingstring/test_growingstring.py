@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from pysisyphus.calculators.AnaPot import AnaPot
@@ -198,3 +199,41 @@ def test_climb_lanczos():
 
     assert opt.is_converged
     assert opt.cur_cycle == 23
+
+
+@pytest.mark.parametrize("restore_opt_info", (True, False))
+def test_string_optimizer_restart(restore_opt_info):
+    def get_cos():
+        initial = AnaPot.get_geom((-1.05274, 1.02776, 0))
+        final = AnaPot.get_geom((1.94101, 3.85427, 0))
+        gs_kwargs = {
+            "perp_thresh": 0.5,
+            "reparam_check": "rms",
+        }
+        return GrowingString((initial, final), lambda: AnaPot(), **gs_kwargs)
+
+    opt_kwargs = {
+        "stop_in_when_full": 0,
+        "keep_last": 0,
+    }
+    ref_opt = StringOptimizer(get_cos(), **opt_kwargs)
+    ref_opt.run()
+
+    cos = get_cos()
+    first_opt = StringOptimizer(cos, max_cycles=3, **opt_kwargs)
+    first_opt.run()
+
+    # COS objects don't provide restart information, so only the optimizer
+    # state is carried over, as in Optimizer.set_restart_info().
+    re_opt = StringOptimizer(cos, **opt_kwargs)
+    re_opt.last_cycle = first_opt.cur_cycle + 1
+    for key in ("coords", "energies", "forces", "steps"):
+        setattr(re_opt, key, list(getattr(first_opt, key)))
+    # Restart information from before 'prev_forces_dot' was stored is also handled.
+    opt_restart_info = first_opt._get_opt_restart_info() if restore_opt_info else {}
+    re_opt._set_opt_restart_info(opt_restart_info)
+    re_opt.run()
+
+    assert re_opt.is_converged
+    assert re_opt.cur_cycle == ref_opt.cur_cycle
+    np.testing.assert_allclose(re_opt.steps[-1], ref_opt.steps[-1])
@@ -29,3 +29,19 @@ def test_water_fd_hessian():
     calc = PySCF(basis="321g", pal=2)
     geom.set_calculator(calc)
     assert_hessians(geom)
+
+
+def test_forward_fd_hessian():
+    geom = AnaPot().get_saddles(i=0)
+    coords = geom.coords
+    grad_calls = 0
+
+    def grad_func(coords):
+        nonlocal grad_calls
+        grad_calls += 1
+        return -geom.get_energy_and_forces_at(coords)["forces"]
+
+    fd_hessian = finite_difference_hessian(coords, grad_func, step_size=1e-4, acc=1)
+    # One displacement per coordinate and the reference gradient
+    assert grad_calls == coords.size + 1
+    np.testing.assert_allclose(fd_hessian, geom.hessian, atol=1e-3)
@@ -1,13 +1,16 @@
+import os
+from pathlib import Path
 import yaml
 from pprint import pprint
 
 import numpy as np
 import pytest
 
+from pysisyphus.calculators.AnaPot import AnaPot
 from pysisyphus.cos.ChainOfStates import ChainOfStates
 from pysisyphus.Geometry import Geometry
 from pysisyphus.helpers import geom_loader
-from pysisyphus.run import run_from_dict
+from pysisyphus.run import load_run_dict, run_calculations, run_from_dict
 from pysisyphus.testing import using
 
 
@@ -81,6 +84,38 @@ def test_run_results():
     assert results.calc_getter
 
 
+@using("pyscf")
+def test_run_calculations_processes():
+    run_dict = {
+        "geom": {
+            "type": "cart",
+            "fn": ["lib:h2o.xyz", "lib:h2o2_hf_321g_opt.xyz"],
+        },
+        "calc": {"type": "pyscf", "basis": "sto3g", "max_workers": 2},
+    }
+    results = run_from_dict(run_dict)
+
+    energies = [geom.energy for geom in results.calced_geoms]
+    np.testing.assert_allclose(energies, (-74.96070249, -148.72236645))
+    # The state of the calculator copies in the worker processes is taken over
+    for geom in results.calced_geoms:
+        calc = geom.calculator
+        assert calc.calc_counter == 1
+        assert Path(calc.get_chkfiles()["chkfile"]).exists()
+
+
+def test_run_calculations_unpicklable(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    geoms = AnaPot().get_path(num=2)
+    # The lambdified potentials of AnaPot can't be pickled, so the calculations
+    # are run serially.
+    _, all_results = run_calculations(
+        geoms, AnaPot, run_func="get_energy", max_workers=2
+    )
+    energies = [results["energy"] for results in all_results]
+    np.testing.assert_allclose(energies, [geom.energy for geom in geoms])
+
+
 @using("pyscf")
 def test_run_dimer_irc():
     """Quick test to see if the Dimer method works well with
@@ -194,3 +229,29 @@ def test_new_style_yaml():
     )
     results = run_from_dict(run_dict)
     assert results.opt_geom.energy == pytest.approx(-74.965901183)
+
+
+def test_load_run_dict_cache(tmp_path):
+    yaml_fn = tmp_path / "inp.yaml"
+    yaml_fn.write_text("geom:\n fn: lib:h2o.xyz\ncalc:\n type: dummy\n")
+    cache_fn = tmp_path / "inp.yaml.pkl"
+
+    # Caching is opt-in
+    run_dict = load_run_dict(str(yaml_fn))
+    assert not cache_fn.exists()
+
+    assert load_run_dict(str(yaml_fn), use_cache=True) == run_dict
+    assert cache_fn.exists()
+    assert load_run_dict(str(yaml_fn), use_cache=True) == run_dict
+    # No temporary files are left behind
+    assert sorted(fn.name for fn in tmp_path.iterdir()) == ["inp.yaml", "inp.yaml.pkl"]
+
+    # Caches of a different YAML input are ignored, even when they are newer.
+    yaml_fn.write_text("geom:\n fn: lib:h2o2_hf_321g_opt.xyz\n")
+    cache_mtime = yaml_fn.stat().st_mtime + 10
+    os.utime(cache_fn, (cache_mtime, cache_mtime))
+    run_dict = load_run_dict(str(yaml_fn), use_cache=True)
+    assert run_dict == {"geom": {"fn": "lib:h2o2_hf_321g_opt.xyz"}}
+    # Invalid caches are ignored
+    cache_fn.write_bytes(b"")
+    assert load_run_dict(str(yaml_fn), use_cache=True) == run_dict
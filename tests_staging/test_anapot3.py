@@ -41,8 +41,9 @@ def get_geoms():
 def run_cos_opt(cos, Opt, images, **kwargs):
     cos.interpolate(images)
     opt = Opt(cos, **kwargs)
+    calc = AnaPot3()
     for img in cos.images:
-        img.set_calculator(AnaPot3())
+        img.set_calculator(calc)
     opt.run()
 
     return opt